@@ -0,0 +1,37 @@
+"""
+Response classes for the Stock Talk API.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Encode types orjson doesn't handle natively (Postgres NUMERIC -> Decimal)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes the same way ORJSONResponse does."""
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson.
+
+    orjson encodes datetimes, numpy scalars and non-str dict keys natively, so
+    routes can hand it ORM values without a jsonable_encoder pass. Returning an
+    instance (rather than a dict) also skips FastAPI's own encoder walk.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,22 +2,95 @@
 API routes for Stock Talk application.
 """
 
+import base64
+import binascii
+import logging
+import multiprocessing
+import threading
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session, object_session, selectinload, undefer_group
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.database import get_db, SessionLocal
+from app.core.logging import configure_logging
+from app.api.responses import ORJSONResponse, dumps
+from app.api.schemas import build_stock_row
 from app.models import DailyReport, ReportStock, Stock, WatchlistStock
 from app.services.report_generator import generate_daily_report
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Serialized bodies for /reports/latest and /stats. Keys include the newest
+# report's id and created_at, so a freshly generated report is served without
+# explicit invalidation (reports may be generated in another process). The id
+# alone isn't enough: regenerating today's report deletes the row, and SQLite
+# can reuse its id for the replacement.
+_response_cache = TTLCache(maxsize=32, ttl=60)
+
+
+# Built once; runs on every /reports/latest and /stats request
+_LATEST_REPORT_VERSION_STMT = (
+    select(DailyReport.id, DailyReport.created_at).order_by(DailyReport.id.desc()).limit(1)
+)
+
+
+def _latest_report_version(db: Session) -> Optional[tuple]:
+    """Return (id, created_at) of the newest report (one primary-key index
+    probe), or None if there are no reports."""
+    row = db.execute(_LATEST_REPORT_VERSION_STMT).first()
+    return tuple(row) if row else None
+
+
+def _load_report_with_stocks(db: Session, *criteria) -> Optional[DailyReport]:
+    """Load the newest report matching criteria, with its stocks eagerly loaded.
+
+    selectinload fetches the report's stocks (already ordered by rank via the
+    relationship) in one IN query, and joinedload pulls each Stock alongside,
+    so _format_report never triggers per-row lazy loads.
+    """
+    return (
+        db.query(DailyReport)
+        .options(selectinload(DailyReport.stocks).joinedload(ReportStock.stock))
+        .filter(*criteria)
+        .order_by(DailyReport.report_date.desc())
+        .first()
+    )
+
+
+def _encode_cursor(report_date: datetime, report_id: int) -> str:
+    """Encode a (report_date, id) keyset position as an opaque cursor."""
+    raw = f"{report_date.isoformat()}|{report_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_str, id_str = raw.split("|")
+        return datetime.fromisoformat(date_str), int(id_str)
+    except (ValueError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Full report generation runs in a child process so its CPU-bound analysis
+# doesn't hold the web process's GIL. Only one runs at a time.
+_full_report_process: Optional[multiprocessing.process.BaseProcess] = None
+_full_report_lock = threading.Lock()
 
 
 def _generate_full_report_background():
-    """Background task to generate full report with worker settings."""
+    """Generate a full report with worker settings (child process entry point)."""
+    configure_logging()
     db = SessionLocal()
     try:
         generate_daily_report(db, max_stocks=settings.MAX_STOCKS_WORKER)
@@ -27,22 +100,44 @@ def _generate_full_report_background():
 
 @router.get("/reports")
 def get_reports(
-    limit: int = Query(default=30, le=100),
+    limit: int = Query(default=30, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None),
+    include_total: bool = Query(default=False),
     db: Session = Depends(get_db),
 ):
-    """Get list of all reports with pagination."""
-    reports = (
-        db.query(DailyReport)
-        .order_by(DailyReport.report_date.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
+    """
+    Get list of reports, newest first.
 
-    total = db.query(DailyReport).count()
+    Pass the returned next_cursor back as ?cursor= to fetch the following page;
+    this seeks on (report_date, id) instead of making the database skip rows.
+    offset is still honoured when no cursor is given. The total row count is
+    only computed when include_total is set.
+    """
+    # Select only the listed columns; the wide text columns are never read here
+    query = db.query(
+        DailyReport.id,
+        DailyReport.report_date,
+        DailyReport.total_stocks_analyzed,
+        DailyReport.stocks_passing_criteria,
+    ).order_by(DailyReport.report_date.desc(), DailyReport.id.desc())
+
+    if cursor:
+        cursor_date, cursor_id = _decode_cursor(cursor)
+        query = query.filter(
+            tuple_(DailyReport.report_date, DailyReport.id) < (cursor_date, cursor_id)
+        )
+    elif offset:
+        query = query.offset(offset)
 
-    return {
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    reports = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = _encode_cursor(reports[-1].report_date, reports[-1].id)
+
+    response = {
         "reports": [
             {
                 "id": r.id,
@@ -52,26 +147,34 @@ def get_reports(
             }
             for r in reports
         ],
-        "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": next_cursor,
     }
 
+    if include_total:
+        response["total"] = db.query(DailyReport).count()
+
+    return ORJSONResponse(response)
+
 
 @router.get("/reports/latest")
 def get_latest_report(db: Session = Depends(get_db)):
     """Get the most recent report with full details."""
-    report = (
-        db.query(DailyReport)
-        .options(joinedload(DailyReport.stocks).joinedload(ReportStock.stock))
-        .order_by(DailyReport.report_date.desc())
-        .first()
-    )
-
-    if not report:
+    latest_version = _latest_report_version(db)
+    if latest_version is None:
         raise HTTPException(status_code=404, detail="No reports found")
 
-    return _format_report(report)
+    cache_key = ("reports/latest", latest_version)
+    body = _response_cache.get(cache_key)
+    if body is None:
+        report = _load_report_with_stocks(db)
+        if not report:
+            raise HTTPException(status_code=404, detail="No reports found")
+        body = dumps(_format_report(report))
+        _response_cache.set(cache_key, body)
+
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/reports/generate")
@@ -96,12 +199,29 @@ def trigger_report_generation_get(db: Session = Depends(get_db)):
 
 
 @router.get("/reports/generate-full")
-def trigger_full_report_generation(background_tasks: BackgroundTasks):
+def trigger_full_report_generation():
     """
     Trigger full report generation (60 stocks, 3 years history) in background.
-    This runs asynchronously and won't timeout.
+    This runs in a separate process and won't timeout.
     """
-    background_tasks.add_task(_generate_full_report_background)
+    global _full_report_process
+
+    with _full_report_lock:
+        if _full_report_process is not None and _full_report_process.is_alive():
+            return {
+                "status": "running",
+                "message": "Full report generation is already in progress. "
+                           "Check back in a few minutes and refresh the homepage to see results.",
+            }
+
+        # spawn, not fork: the web process has live threads and pooled connections
+        _full_report_process = multiprocessing.get_context("spawn").Process(
+            target=_generate_full_report_background,
+            name="full-report-generation",
+            daemon=True,
+        )
+        _full_report_process.start()
+
     return {
         "status": "started",
         "message": f"Full report generation started in background ({settings.MAX_STOCKS_WORKER} stocks). "
@@ -109,70 +229,107 @@ def trigger_full_report_generation(background_tasks: BackgroundTasks):
     }
 
 
+def _iter_report_export(batch_size: int = 50):
+    """Yield every report, newest first, as one NDJSON line each.
+
+    Opens its own session because it runs while the response streams. Rows
+    are fetched in yield_per batches, so only one batch of reports is held
+    in memory at a time.
+    """
+    db = SessionLocal()
+    try:
+        stmt = (
+            select(DailyReport)
+            .options(selectinload(DailyReport.stocks).joinedload(ReportStock.stock))
+            .order_by(DailyReport.report_date.desc(), DailyReport.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        for report in db.scalars(stmt):
+            yield dumps(_format_report(report)) + b"\n"
+    finally:
+        db.close()
+
+
+@router.get("/reports/export")
+def export_reports():
+    """Stream all reports with full details as newline-delimited JSON."""
+    return StreamingResponse(_iter_report_export(), media_type="application/x-ndjson")
+
+
 @router.get("/reports/{report_id}")
 def get_report(report_id: int, db: Session = Depends(get_db)):
     """Get a specific report by ID."""
-    report = (
-        db.query(DailyReport)
-        .options(joinedload(DailyReport.stocks).joinedload(ReportStock.stock))
-        .filter(DailyReport.id == report_id)
-        .first()
-    )
+    report = _load_report_with_stocks(db, DailyReport.id == report_id)
 
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    return _format_report(report)
+    return ORJSONResponse(_format_report(report))
 
 
 @router.get("/reports/date/{date}")
-def get_report_by_date(date: str, db: Session = Depends(get_db)):
+def get_report_by_date(
+    date: str = Path(pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    db: Session = Depends(get_db),
+):
     """Get report for a specific date (YYYY-MM-DD format)."""
     try:
-        report_date = datetime.strptime(date, "%Y-%m-%d")
+        start_of_day = datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-    # Look for report on this date
-    start_of_day = report_date.replace(hour=0, minute=0, second=0)
-    end_of_day = report_date.replace(hour=23, minute=59, second=59)
-
-    report = (
-        db.query(DailyReport)
-        .options(joinedload(DailyReport.stocks).joinedload(ReportStock.stock))
-        .filter(DailyReport.report_date >= start_of_day)
-        .filter(DailyReport.report_date <= end_of_day)
-        .first()
+    # Half-open [start, next day) range: covers the whole day, including
+    # sub-second timestamps, as a plain index range scan
+    report = _load_report_with_stocks(
+        db,
+        DailyReport.report_date >= start_of_day,
+        DailyReport.report_date < start_of_day + timedelta(days=1),
     )
 
     if not report:
         raise HTTPException(status_code=404, detail=f"No report found for {date}")
 
-    return _format_report(report)
+    return ORJSONResponse(_format_report(report))
 
 
 @router.get("/stocks/{ticker}")
 def get_stock_history(
-    ticker: str,
+    ticker: str = Path(pattern=r"^[A-Za-z][A-Za-z0-9.\-]{0,9}$"),
     limit: int = Query(default=30, le=100),
     db: Session = Depends(get_db),
 ):
     """Get historical report data for a specific stock."""
-    stock = db.query(Stock).filter(Stock.ticker == ticker.upper()).first()
+    stock = (
+        db.query(Stock.id, Stock.ticker, Stock.name, Stock.sector, Stock.industry)
+        .filter(Stock.ticker == ticker.upper())
+        .first()
+    )
 
     if not stock:
         raise HTTPException(status_code=404, detail=f"Stock {ticker} not found")
 
+    # Join for report_date only instead of loading whole DailyReport rows
     report_entries = (
-        db.query(ReportStock)
-        .options(joinedload(ReportStock.report))
+        db.query(
+            DailyReport.report_date,
+            ReportStock.rank,
+            ReportStock.is_dark_horse,
+            ReportStock.price_at_report,
+            ReportStock.pct_from_ath,
+            ReportStock.pe_ratio,
+            ReportStock.rsi,
+            ReportStock.reddit_mentions_week,
+            ReportStock.sentiment_label,
+            ReportStock.buy_case,
+        )
+        .join(DailyReport, DailyReport.id == ReportStock.report_id)
         .filter(ReportStock.stock_id == stock.id)
         .order_by(ReportStock.created_at.desc())
         .limit(limit)
         .all()
     )
 
-    return {
+    return ORJSONResponse({
         "ticker": stock.ticker,
         "name": stock.name,
         "sector": stock.sector,
@@ -180,7 +337,7 @@ def get_stock_history(
         "appearances": len(report_entries),
         "history": [
             {
-                "report_date": entry.report.report_date.isoformat(),
+                "report_date": entry.report_date,
                 "rank": entry.rank,
                 "is_dark_horse": entry.is_dark_horse,
                 "price": entry.price_at_report,
@@ -193,7 +350,7 @@ def get_stock_history(
             }
             for entry in report_entries
         ],
-    }
+    })
 
 
 @router.get("/stocks")
@@ -203,30 +360,48 @@ def search_stocks(
     db: Session = Depends(get_db),
 ):
     """Search stocks that have appeared in reports."""
-    query = db.query(Stock)
-
-    if q:
-        search_term = f"%{q.upper()}%"
-        query = query.filter(
-            (Stock.ticker.ilike(search_term)) | (Stock.name.ilike(search_term))
-        )
+    query = db.query(
+        Stock.ticker, Stock.name, Stock.sector, Stock.industry, Stock.market_cap
+    )
 
     if sector:
         query = query.filter(Stock.sector.ilike(f"%{sector}%"))
 
+    # Something typed like a ticker: try the unique ticker index first
+    if q.isupper() and len(q) <= 5:
+        stocks = query.filter(Stock.ticker == q).all()
+        if stocks:
+            return ORJSONResponse({"results": [_search_result(s) for s in stocks]})
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Substring match backed by the pg_trgm GIN indexes, closest first
+        search_term = f"%{q}%"
+        query = query.filter(
+            Stock.ticker.ilike(search_term) | Stock.name.ilike(search_term)
+        ).order_by(
+            func.greatest(
+                func.similarity(Stock.ticker, q), func.similarity(Stock.name, q)
+            ).desc()
+        )
+    else:
+        query = query.filter(
+            Stock.ticker.istartswith(q, autoescape=True)
+            | Stock.name.istartswith(q, autoescape=True)
+        )
+
     stocks = query.limit(20).all()
 
+    return ORJSONResponse({"results": [_search_result(s) for s in stocks]})
+
+
+def _search_result(row) -> dict:
+    """Format a projected stock row for search results."""
     return {
-        "results": [
-            {
-                "ticker": s.ticker,
-                "name": s.name,
-                "sector": s.sector,
-                "industry": s.industry,
-                "market_cap": s.market_cap,
-            }
-            for s in stocks
-        ]
+        "ticker": row.ticker,
+        "name": row.name,
+        "sector": row.sector,
+        "industry": row.industry,
+        "market_cap": row.market_cap,
     }
 
 
@@ -253,17 +428,30 @@ def trigger_report_generation(db: Session = Depends(get_db)):
 @router.get("/stats")
 def get_stats(db: Session = Depends(get_db)):
     """Get overall statistics."""
-    total_reports = db.query(DailyReport).count()
-    total_stocks = db.query(Stock).count()
-
-    # Most featured stocks
-    from sqlalchemy import func
-
+    cache_key = ("stats", _latest_report_version(db))
+    body = _response_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    # Both totals in one round trip
+    total_reports, total_stocks = db.execute(
+        select(
+            select(func.count(DailyReport.id)).scalar_subquery(),
+            select(func.count(Stock.id)).scalar_subquery(),
+        )
+    ).one()
+
+    # Most featured stocks: aggregate report_stocks on its own (served by the
+    # stock_id index), then join just the top 10 to stocks for names
+    appearances = (
+        db.query(ReportStock.stock_id, func.count(ReportStock.id).label("count"))
+        .group_by(ReportStock.stock_id)
+        .subquery()
+    )
     top_stocks = (
-        db.query(Stock.ticker, Stock.name, func.count(ReportStock.id).label("count"))
-        .join(ReportStock)
-        .group_by(Stock.id)
-        .order_by(func.count(ReportStock.id).desc())
+        db.query(Stock.ticker, Stock.name, appearances.c.count)
+        .join(appearances, appearances.c.stock_id == Stock.id)
+        .order_by(appearances.c.count.desc(), Stock.ticker)
         .limit(10)
         .all()
     )
@@ -275,14 +463,17 @@ def get_stats(db: Session = Depends(get_db)):
         .all()
     )
 
-    return {
+    body = dumps({
         "total_reports": total_reports,
         "total_unique_stocks": total_stocks,
         "top_featured_stocks": [
             {"ticker": t[0], "name": t[1], "appearances": t[2]} for t in top_stocks
         ],
         "sector_distribution": {s[0]: s[1] for s in sector_dist if s[0]},
-    }
+    })
+    _response_cache.set(cache_key, body)
+
+    return Response(content=body, media_type="application/json")
 
 
 # ==================== WATCHLIST ENDPOINTS ====================
@@ -395,148 +586,78 @@ def update_watchlist_stock(
     }
 
 
+class _SummaryRow(NamedTuple):
+    """Fields the sector summary needs from a pre-encoded stock row."""
+
+    sector_category: Optional[str]
+    sector: Optional[str]
+    pe_ratio: Optional[float]
+    pb_ratio: Optional[float]
+    profit_margin: Optional[float]
+    debt_to_equity: Optional[float]
+
+
 def _format_report(report: DailyReport) -> dict:
-    """Format a report with all its stocks for API response."""
-    stocks_data = []
-
-    # Sort by rank, handling potential None values
-    sorted_stocks = sorted(report.stocks, key=lambda x: getattr(x, 'rank', 999) or 999)
-
-    for rs in sorted_stocks:
-        try:
-            stock = rs.stock
-
-            # Calculate 52-week position (using getattr for potentially missing columns)
-            week_52_position = None
-            fifty_two_high = getattr(rs, 'fifty_two_week_high', None)
-            fifty_two_low = getattr(rs, 'fifty_two_week_low', None)
-            price_at_report = getattr(rs, 'price_at_report', None)
-            if fifty_two_high and fifty_two_low and price_at_report:
-                range_size = fifty_two_high - fifty_two_low
-                if range_size > 0:
-                    week_52_position = round(
-                        ((price_at_report - fifty_two_low) / range_size) * 100, 1
-                    )
-
-            # Use getattr for columns that may not exist in older database schemas
-            stocks_data.append({
-                "rank": rs.rank,
-                "ticker": getattr(stock, 'ticker', 'UNKNOWN') if stock else 'UNKNOWN',
-                "name": getattr(stock, 'name', 'Unknown') if stock else 'Unknown',
-                "sector": getattr(stock, 'sector', 'Unknown') if stock else 'Unknown',
-                "industry": getattr(stock, 'industry', 'Unknown') if stock else 'Unknown',
-                "sector_category": getattr(rs, 'sector_category', None),
-                "is_dark_horse": getattr(rs, 'is_dark_horse', False),
-                "market_cap": getattr(stock, 'market_cap', None) if stock else None,
-                "market_cap_category": getattr(stock, 'market_cap_category', None) if stock else None,
-
-                # Price data
-                "price": getattr(rs, 'price_at_report', None),
-                "pct_from_ath": getattr(rs, 'pct_from_ath', None),
-                "fifty_two_week_high": getattr(rs, 'fifty_two_week_high', None),
-                "fifty_two_week_low": getattr(rs, 'fifty_two_week_low', None),
-                "week_52_position": week_52_position,
-
-                # Valuation
-                "pe_ratio": getattr(rs, 'pe_ratio', None),
-                "forward_pe": getattr(rs, 'forward_pe', None),
-                "pb_ratio": getattr(rs, 'pb_ratio', None),
-                "peg_ratio": getattr(rs, 'peg_ratio', None),
-                "ps_ratio": getattr(rs, 'ps_ratio', None),
-                "ev_ebitda": getattr(rs, 'ev_ebitda', None),
-
-                # Financial health
-                "debt_to_equity": getattr(rs, 'debt_to_equity', None),
-                "free_cash_flow": getattr(rs, 'free_cash_flow', None),
-                "profit_margin": getattr(rs, 'profit_margin', None),
-                "gross_margin": getattr(rs, 'gross_margin', None),
-                "operating_margin": getattr(rs, 'operating_margin', None),
-                "current_ratio": getattr(rs, 'current_ratio', None),
-
-                # Dividends
-                "dividend_yield": getattr(rs, 'dividend_yield', None),
-
-                # Technical
-                "rsi": getattr(rs, 'rsi', None),
-                "beta": getattr(rs, 'beta', None),
-                "one_year_return": getattr(rs, 'one_year_return', None),
-                "three_month_return": getattr(rs, 'three_month_return', None),
-                "ytd_return": getattr(rs, 'ytd_return', None),
-                "one_month_return": getattr(rs, 'one_month_return', None),
-
-                # Volume
-                "avg_volume": getattr(rs, 'avg_volume', None),
-                "recent_volume": getattr(rs, 'recent_volume', None),
-
-                # Moving averages
-                "sma_50": getattr(rs, 'sma_50', None),
-                "sma_200": getattr(rs, 'sma_200', None),
-
-                # Company info
-                "business_summary": getattr(rs, 'business_summary', '') or "",
-
-                # Ownership
-                "short_interest": getattr(rs, 'short_interest', None),
-                "institutional_ownership": getattr(rs, 'institutional_ownership', None),
-                "insider_ownership": getattr(rs, 'insider_ownership', None),
-
-                # Analyst
-                "analyst_rating": getattr(rs, 'analyst_rating', None),
-                "analyst_count": getattr(rs, 'analyst_count', None),
-                "target_price_mean": getattr(rs, 'target_price_mean', None),
-                "target_price_low": getattr(rs, 'target_price_low', None),
-                "target_price_high": getattr(rs, 'target_price_high', None),
-                "target_upside_pct": getattr(rs, 'target_upside_pct', None),
-
-                # Earnings
-                "next_earnings_date": getattr(rs, 'next_earnings_date', None).isoformat() if getattr(rs, 'next_earnings_date', None) else None,
-                "earnings_surprise_pct": getattr(rs, 'earnings_surprise_pct', None),
-
-                # Reddit
-                "reddit_mentions": getattr(rs, 'reddit_mentions_week', None),
-                "reddit_sentiment": getattr(rs, 'reddit_sentiment', None),
-                "sentiment_label": getattr(rs, 'sentiment_label', None),
-
-                # Activity & News
-                "insider_activity": getattr(rs, 'insider_activity', None) or [],
-                "recent_news": getattr(rs, 'recent_news', None) or [],
-
-                # Analysis
-                "buy_case": getattr(rs, 'buy_case', None),
-                "risk_factors": getattr(rs, 'risk_factors', None) or [],
-                "dark_horse_reasons": getattr(rs, 'dark_horse_reasons', None) or [],
-
-                # Signals
-                "bullish_signals": getattr(rs, 'bullish_signals', None),
-                "bearish_signals": getattr(rs, 'bearish_signals', None),
-                "neutral_signals": getattr(rs, 'neutral_signals', None),
-            })
-        except Exception as e:
-            # Skip stocks that fail to load, log the error
-            import logging
-            logging.getLogger(__name__).error(f"Error formatting stock in report: {e}")
-            continue
+    """Format a report with all its stocks for API response.
+
+    Stocks are StockRow dataclasses and datetimes are left as-is; orjson
+    serializes both natively. Reports whose rows were pre-encoded at
+    generation time splice those bytes in as an orjson.Fragment instead.
+    """
+    # report.stocks arrives ordered by rank (see DailyReport.stocks)
+    blobs = [rs.serialized_json for rs in report.stocks]
+    if blobs and all(blobs):
+        stocks = orjson.Fragment(b"[" + b",".join(blobs) + b"]")
+        stocks_data = [
+            _SummaryRow(
+                sector_category=rs.sector_category,
+                sector=rs.stock.sector if rs.stock else "Unknown",
+                pe_ratio=rs.pe_ratio,
+                pb_ratio=rs.pb_ratio,
+                profit_margin=rs.profit_margin,
+                debt_to_equity=rs.debt_to_equity,
+            )
+            for rs in report.stocks
+        ]
+    else:
+        # No pre-encoded rows (older reports): load the deferred "detail"
+        # columns for every stock in one query instead of one per row
+        session = object_session(report)
+        if session is not None:
+            session.query(ReportStock).options(undefer_group("detail")).filter(
+                ReportStock.report_id == report.id
+            ).all()
+
+        stocks_data = []
+        for rs in report.stocks:
+            try:
+                stocks_data.append(build_stock_row(rs, rs.stock))
+            except Exception as e:
+                # Skip stocks that fail to load, log the error
+                logger.error(f"Error formatting stock in report: {e}")
+                continue
+        stocks = stocks_data
 
     # Sector summary
     sector_counts = {}
     for s in stocks_data:
-        cat = s["sector_category"] or "other"
+        cat = s.sector_category or "other"
         sector_counts[cat] = sector_counts.get(cat, 0) + 1
 
     # Compute sector averages from this report's stocks
     sector_metrics = {}
     for s in stocks_data:
-        sector = s.get("sector") or "Unknown"
+        sector = s.sector or "Unknown"
         if sector not in sector_metrics:
             sector_metrics[sector] = {"pe": [], "pb": [], "margin": [], "de": []}
-        if s.get("pe_ratio") is not None:
-            sector_metrics[sector]["pe"].append(s["pe_ratio"])
-        if s.get("pb_ratio") is not None:
-            sector_metrics[sector]["pb"].append(s["pb_ratio"])
-        if s.get("profit_margin") is not None:
-            sector_metrics[sector]["margin"].append(s["profit_margin"])
-        if s.get("debt_to_equity") is not None:
-            sector_metrics[sector]["de"].append(s["debt_to_equity"])
+        if s.pe_ratio is not None:
+            sector_metrics[sector]["pe"].append(s.pe_ratio)
+        if s.pb_ratio is not None:
+            sector_metrics[sector]["pb"].append(s.pb_ratio)
+        if s.profit_margin is not None:
+            sector_metrics[sector]["margin"].append(s.profit_margin)
+        if s.debt_to_equity is not None:
+            sector_metrics[sector]["de"].append(s.debt_to_equity)
 
     sector_averages = {}
     for sector, metrics in sector_metrics.items():
@@ -549,21 +670,21 @@ def _format_report(report: DailyReport) -> dict:
 
     return {
         "id": report.id,
-        "date": report.report_date.isoformat() if report.report_date else None,
-        "created_at": report.created_at.isoformat() if getattr(report, 'created_at', None) else None,
-        "stocks_analyzed": getattr(report, 'total_stocks_analyzed', 0),
-        "stocks_passing_criteria": getattr(report, 'stocks_passing_criteria', 0),
-        "market_summary": getattr(report, 'market_summary', None),
-        "sp500_change": getattr(report, 'sp500_change', None),
-        "nasdaq_change": getattr(report, 'nasdaq_change', None),
-        "dow_change": getattr(report, 'dow_change', None),
-        "vix_level": getattr(report, 'vix_level', None),
-        "market_news": getattr(report, 'market_news', None) or [],
+        "date": report.report_date,
+        "created_at": report.created_at,
+        "stocks_analyzed": report.total_stocks_analyzed,
+        "stocks_passing_criteria": report.stocks_passing_criteria,
+        "market_summary": report.market_summary,
+        "sp500_change": report.sp500_change,
+        "nasdaq_change": report.nasdaq_change,
+        "dow_change": report.dow_change,
+        "vix_level": report.vix_level,
+        "market_news": report.market_news or [],
         "tip_of_the_day": {
-            "title": getattr(report, 'tip_of_the_day_title', None),
-            "content": getattr(report, 'tip_of_the_day_content', None),
+            "title": report.tip_of_the_day_title,
+            "content": report.tip_of_the_day_content,
         },
         "sector_breakdown": sector_counts,
         "sector_averages": sector_averages,
-        "stocks": stocks_data,
+        "stocks": stocks,
     }
@@ -0,0 +1,213 @@
+"""
+Response shapes for the Stock Talk API.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(slots=True)
+class StockRow:
+    """One ranked stock in a formatted report. orjson serializes it directly."""
+
+    rank: int
+    ticker: str
+    name: str
+    sector: Optional[str]
+    industry: Optional[str]
+    sector_category: Optional[str]
+    is_dark_horse: Optional[bool]
+    market_cap: Optional[float]
+    market_cap_category: Optional[str]
+
+    # Price data
+    price: Optional[float]
+    pct_from_ath: Optional[float]
+    fifty_two_week_high: Optional[float]
+    fifty_two_week_low: Optional[float]
+    week_52_position: Optional[float]
+
+    # Valuation
+    pe_ratio: Optional[float]
+    forward_pe: Optional[float]
+    pb_ratio: Optional[float]
+    peg_ratio: Optional[float]
+    ps_ratio: Optional[float]
+    ev_ebitda: Optional[float]
+
+    # Financial health
+    debt_to_equity: Optional[float]
+    free_cash_flow: Optional[float]
+    profit_margin: Optional[float]
+    gross_margin: Optional[float]
+    operating_margin: Optional[float]
+    current_ratio: Optional[float]
+
+    # Dividends
+    dividend_yield: Optional[float]
+
+    # Technical
+    rsi: Optional[float]
+    beta: Optional[float]
+    one_year_return: Optional[float]
+    three_month_return: Optional[float]
+    ytd_return: Optional[float]
+    one_month_return: Optional[float]
+
+    # Volume
+    avg_volume: Optional[float]
+    recent_volume: Optional[float]
+
+    # Moving averages
+    sma_50: Optional[float]
+    sma_200: Optional[float]
+
+    # Company info
+    business_summary: str
+
+    # Ownership
+    short_interest: Optional[float]
+    institutional_ownership: Optional[float]
+    insider_ownership: Optional[float]
+
+    # Analyst
+    analyst_rating: Optional[str]
+    analyst_count: Optional[int]
+    target_price_mean: Optional[float]
+    target_price_low: Optional[float]
+    target_price_high: Optional[float]
+    target_upside_pct: Optional[float]
+
+    # Earnings
+    next_earnings_date: Optional[datetime]
+    earnings_surprise_pct: Optional[float]
+
+    # Reddit
+    reddit_mentions: Optional[int]
+    reddit_sentiment: Optional[float]
+    sentiment_label: Optional[str]
+
+    # Activity & News
+    insider_activity: list
+    recent_news: list
+
+    # Analysis
+    buy_case: Optional[str]
+    risk_factors: list
+    dark_horse_reasons: list
+
+    # Signals
+    bullish_signals: Optional[int]
+    bearish_signals: Optional[int]
+    neutral_signals: Optional[int]
+
+
+def build_stock_row(rs, stock) -> StockRow:
+    """Build the API row for a ReportStock and its Stock (which may be None)."""
+    # Calculate 52-week position
+    week_52_position = None
+    fifty_two_high = rs.fifty_two_week_high
+    fifty_two_low = rs.fifty_two_week_low
+    price_at_report = rs.price_at_report
+    if fifty_two_high and fifty_two_low and price_at_report:
+        range_size = fifty_two_high - fifty_two_low
+        if range_size > 0:
+            week_52_position = round(
+                ((price_at_report - fifty_two_low) / range_size) * 100, 1
+            )
+
+    # Plain attribute access: every column is mapped on the model, and on
+    # Postgres the app.migrate release step adds any missing from older databases
+    return StockRow(
+        rank=rs.rank,
+        ticker=stock.ticker if stock else 'UNKNOWN',
+        name=stock.name if stock else 'Unknown',
+        sector=stock.sector if stock else 'Unknown',
+        industry=stock.industry if stock else 'Unknown',
+        sector_category=rs.sector_category,
+        is_dark_horse=rs.is_dark_horse,
+        market_cap=stock.market_cap if stock else None,
+        market_cap_category=stock.market_cap_category if stock else None,
+
+        # Price data
+        price=rs.price_at_report,
+        pct_from_ath=rs.pct_from_ath,
+        fifty_two_week_high=rs.fifty_two_week_high,
+        fifty_two_week_low=rs.fifty_two_week_low,
+        week_52_position=week_52_position,
+
+        # Valuation
+        pe_ratio=rs.pe_ratio,
+        forward_pe=rs.forward_pe,
+        pb_ratio=rs.pb_ratio,
+        peg_ratio=rs.peg_ratio,
+        ps_ratio=rs.ps_ratio,
+        ev_ebitda=rs.ev_ebitda,
+
+        # Financial health
+        debt_to_equity=rs.debt_to_equity,
+        free_cash_flow=rs.free_cash_flow,
+        profit_margin=rs.profit_margin,
+        gross_margin=rs.gross_margin,
+        operating_margin=rs.operating_margin,
+        current_ratio=rs.current_ratio,
+
+        # Dividends
+        dividend_yield=rs.dividend_yield,
+
+        # Technical
+        rsi=rs.rsi,
+        beta=rs.beta,
+        one_year_return=rs.one_year_return,
+        three_month_return=rs.three_month_return,
+        ytd_return=rs.ytd_return,
+        one_month_return=rs.one_month_return,
+
+        # Volume
+        avg_volume=rs.avg_volume,
+        recent_volume=rs.recent_volume,
+
+        # Moving averages
+        sma_50=rs.sma_50,
+        sma_200=rs.sma_200,
+
+        # Company info
+        business_summary=rs.business_summary or "",
+
+        # Ownership
+        short_interest=rs.short_interest,
+        institutional_ownership=rs.institutional_ownership,
+        insider_ownership=rs.insider_ownership,
+
+        # Analyst
+        analyst_rating=rs.analyst_rating,
+        analyst_count=rs.analyst_count,
+        target_price_mean=rs.target_price_mean,
+        target_price_low=rs.target_price_low,
+        target_price_high=rs.target_price_high,
+        target_upside_pct=rs.target_upside_pct,
+
+        # Earnings
+        next_earnings_date=rs.next_earnings_date,
+        earnings_surprise_pct=rs.earnings_surprise_pct,
+
+        # Reddit
+        reddit_mentions=rs.reddit_mentions_week,
+        reddit_sentiment=rs.reddit_sentiment,
+        sentiment_label=rs.sentiment_label,
+
+        # Activity & News
+        insider_activity=rs.insider_activity or [],
+        recent_news=rs.recent_news or [],
+
+        # Analysis
+        buy_case=rs.buy_case,
+        risk_factors=rs.risk_factors or [],
+        dark_horse_reasons=rs.dark_horse_reasons or [],
+
+        # Signals
+        bullish_signals=rs.bullish_signals,
+        bearish_signals=rs.bearish_signals,
+        neutral_signals=rs.neutral_signals,
+    )
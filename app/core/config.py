@@ -1,5 +1,5 @@
 import os
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,6 +11,14 @@ class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./stock_talk.db")
 
+    # Connection pool (Postgres only; SQLite keeps SQLAlchemy's defaults)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # Seconds before reconnecting
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))  # 0 disables
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # SELECT 1 per checkout
+
     # Reddit API (optional, fallback to Finnhub if not set)
     REDDIT_CLIENT_ID: str = os.getenv("REDDIT_CLIENT_ID", "")
     REDDIT_CLIENT_SECRET: str = os.getenv("REDDIT_CLIENT_SECRET", "")
@@ -53,13 +61,13 @@ class Settings:
     MAX_STOCKS_WEB: int = 25  # Max stocks for web request (fast, avoids timeout)
     MAX_STOCKS_WORKER: int = 400  # Max stocks for worker (no timeout constraint)
 
-    @property
+    @cached_property
     def is_production(self) -> bool:
         return self.ENVIRONMENT == "production"
 
-    @property
+    @cached_property
     def database_url_sync(self) -> str:
-        """Convert async database URL to sync if needed."""
+        """Convert async database URL to sync if needed (computed once)."""
         url = self.DATABASE_URL
         if url.startswith("postgres://"):
             url = url.replace("postgres://", "postgresql://", 1)
@@ -1,22 +1,112 @@
 import logging
-from sqlalchemy import create_engine, text
+
+from sqlalchemy import Column, DateTime, Integer, Table, create_engine, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
-engine = create_engine(
-    settings.database_url_sync,
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
+
+def _engine_options(url: str, **pool_overrides) -> dict:
+    """Build create_engine() keyword arguments for the configured backend.
+
+    pool_overrides replace the Settings-derived pool arguments (Postgres only).
+    """
+    if url.startswith("sqlite"):
+        # Sessions are used from FastAPI's threadpool, not just the creating thread
+        return {"connect_args": {"check_same_thread": False}}
+
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # Reuse the most recently returned connection so idle ones can age out
+        "pool_use_lifo": True,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
+    options.update(pool_overrides)
+    return options
+
+
+def _create_engine(**pool_overrides):
+    return create_engine(
+        settings.database_url_sync,
+        # Compiled-statement cache; the default 500 entries churns once routes,
+        # the report generator and migrations are all warm
+        query_cache_size=1200,
+        **_engine_options(settings.database_url_sync, **pool_overrides),
+    )
+
+
+engine = _create_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def configure_engine(**pool_overrides):
+    """Replace the engine with one using different pool settings.
+
+    For processes whose workload differs from the web server's, e.g. the
+    scheduler. Call before any sessions are opened.
+    """
+    global engine
+    engine.dispose()
+    engine = _create_engine(**pool_overrides)
+    SessionLocal.configure(bind=engine)
+
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database.
+
+    Used for server-side created_at/updated_at defaults. Timestamp columns
+    are naive UTC (as datetime.utcnow produced), so Postgres converts from
+    the session time zone explicitly.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+# Bump whenever run_migrations() gains a step, or a model gains an index or
+# server default, so existing databases run the migrations once more
+SCHEMA_VERSION = 5
+
+# One row per applied SCHEMA_VERSION; lets init_db() skip migrations in one SELECT
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("applied_at", DateTime, server_default=utcnow()),
+)
+
+
+# Advisory lock key serializing run_migrations() across processes (the web
+# service's app.migrate and the worker's init_db run in the same deploy)
+MIGRATION_LOCK_ID = 7_305_112_001
+
+
 def get_db():
     """Dependency for getting database sessions."""
     db = SessionLocal()
@@ -26,31 +116,174 @@ def get_db():
         db.close()
 
 
-def _migrate_table(conn, table_name: str, columns: list[tuple[str, str]]):
-    """Add missing columns to a table."""
+def _migrate_table(conn, table_name: str, columns: list[tuple[str, str]]) -> bool:
+    """Add missing columns to a table. Returns False if any could not be added."""
+    # IF NOT EXISTS skips columns that are already there, so no probe is needed;
+    # one ALTER TABLE for all of them takes the table lock once
+    names = ", ".join(name for name, _ in columns)
+    try:
+        with conn.begin_nested():
+            conn.execute(text(
+                f"ALTER TABLE {table_name} "
+                + ", ".join(f"ADD COLUMN IF NOT EXISTS {name} {type_}" for name, type_ in columns)
+            ))
+        logger.info(f"Ensured columns {names} on {table_name} table")
+        return True
+    except Exception as e:
+        logger.warning(f"Batched ALTER on {table_name} failed, adding columns one by one: {e}")
+
+    # Fall back to per-column adds so one bad column doesn't block the rest
+    ok = True
     for column_name, column_type in columns:
         try:
-            result = conn.execute(text(f"""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name = '{table_name}' AND column_name = '{column_name}'
-            """))
-            if result.fetchone() is None:
-                logger.info(f"Adding column {column_name} to {table_name} table")
-                conn.execute(text(f"""
-                    ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}
-                """))
-                conn.commit()
-                logger.info(f"Successfully added column {column_name}")
+            with conn.begin_nested():
+                conn.execute(text(
+                    f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column_name} {column_type}"
+                ))
+            logger.info(f"Successfully added column {column_name}")
         except Exception as e:
+            ok = False
             logger.warning(f"Could not add column {column_name}: {e}")
+    return ok
+
+
+def _create_missing_indexes(conn) -> bool:
+    """Create model-declared indexes that are missing on pre-existing tables.
+
+    create_all() skips tables that already exist, including their indexes, so
+    indexes added to a model later are created here. Returns False if any
+    could not be created.
+    """
+    ok = True
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with conn.begin_nested():
+                    index.create(bind=conn, checkfirst=True)
+            except Exception as e:
+                ok = False
+                logger.warning(f"Could not create index {index.name}: {e}")
+    return ok
+
+
+def _apply_server_defaults(conn) -> bool:
+    """Set model-declared server defaults on existing columns (Postgres only).
+
+    Like indexes, defaults on tables created before they were declared are
+    not applied by create_all().
+    """
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if column.server_default is None:
+                continue
+            default = column.server_default.arg
+            if not isinstance(default, str):
+                default = str(default.compile(dialect=conn.dialect))
+            statements.append(
+                f"ALTER TABLE {table.name} ALTER COLUMN {column.name} SET DEFAULT {default}"
+            )
+
+    try:
+        with conn.begin_nested():
+            for statement in statements:
+                conn.execute(text(statement))
+        return True
+    except Exception as e:
+        logger.warning(f"Could not set column defaults: {e}")
+        return False
+
+
+def _convert_json_to_jsonb(conn, table_name: str, column_names: list[str]) -> bool:
+    """Convert json columns created before the models used JSONB (Postgres only)."""
+    try:
+        with conn.begin_nested():
+            conn.execute(text(
+                f"ALTER TABLE {table_name} "
+                + ", ".join(
+                    f"ALTER COLUMN {name} TYPE JSONB USING {name}::jsonb"
+                    for name in column_names
+                )
+            ))
+        return True
+    except Exception as e:
+        logger.warning(f"Could not convert {table_name} JSON columns to JSONB: {e}")
+        return False
+
+
+def _require_json_lists(conn, table_name: str, column_names: list[str]) -> bool:
+    """Backfill NULL list columns with [] and make them NOT NULL (Postgres only)."""
+    try:
+        with conn.begin_nested():
+            for name in column_names:
+                # JSON-typed None was written as JSON null, not SQL NULL
+                conn.execute(text(
+                    f"UPDATE {table_name} SET {name} = '[]' "
+                    f"WHERE {name} IS NULL OR {name} = 'null'::jsonb"
+                ))
+            conn.execute(text(
+                f"ALTER TABLE {table_name} "
+                + ", ".join(f"ALTER COLUMN {name} SET NOT NULL" for name in column_names)
+            ))
+        return True
+    except Exception as e:
+        logger.warning(f"Could not backfill {table_name} JSON list columns: {e}")
+        return False
+
+
+def _create_trigram_indexes(conn) -> bool:
+    """Create pg_trgm GIN indexes backing substring stock search (Postgres only)."""
+    statements = [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_stocks_ticker_trgm ON stocks USING gin (ticker gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_stocks_name_trgm ON stocks USING gin (name gin_trgm_ops)",
+    ]
+    try:
+        with conn.begin_nested():
+            for statement in statements:
+                conn.execute(text(statement))
+        return True
+    except Exception as e:
+        logger.warning(f"Could not create trigram indexes: {e}")
+        return False
 
 
 def run_migrations():
-    """Run database migrations to add missing columns."""
-    with engine.connect() as conn:
+    """Run database migrations to add missing columns.
+
+    Everything runs in one transaction that commits once at the end. Each
+    step is wrapped in a savepoint, so an optional step that fails (e.g. no
+    permission for pg_trgm) is rolled back alone and doesn't undo the rest.
+    SCHEMA_VERSION is recorded only if every step succeeded.
+
+    Concurrent runners are serialized by a transaction-level advisory lock;
+    a runner that gets the lock after another finished sees the version row
+    and returns without migrating again.
+
+    Postgres only: a fresh SQLite file gets the full schema from create_all().
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.begin() as conn:
+        # Table rewrites and index builds can outlast the request-sized
+        # statement_timeout; SET LOCAL ends with this transaction
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+
+        # Held until this transaction ends; re-check the version once we have it
+        conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+        applied = conn.execute(
+            select(schema_migrations.c.version)
+            .where(schema_migrations.c.version == SCHEMA_VERSION)
+        ).first()
+        if applied:
+            logger.info(f"Database schema already at version {SCHEMA_VERSION}")
+            return
+
+        results = []
+
         # report_stocks table
-        _migrate_table(conn, "report_stocks", [
+        results.append(_migrate_table(conn, "report_stocks", [
             ("one_year_return", "FLOAT"),
             ("three_month_return", "FLOAT"),
             ("beta", "FLOAT"),
@@ -73,14 +306,35 @@ def run_migrations():
             ("recent_volume", "FLOAT"),
             ("sma_50", "FLOAT"),
             ("sma_200", "FLOAT"),
-        ])
+            ("serialized_json", "BYTEA"),
+        ]))
 
         # daily_reports table
-        _migrate_table(conn, "daily_reports", [
+        results.append(_migrate_table(conn, "daily_reports", [
             ("dow_change", "FLOAT"),
             ("vix_level", "FLOAT"),
             ("market_news", "JSONB"),
-        ])
+        ]))
+
+        results.append(_create_missing_indexes(conn))
+        results.append(_convert_json_to_jsonb(conn, "report_stocks", [
+            "insider_activity", "risk_factors", "recent_news", "dark_horse_reasons",
+        ]))
+        results.append(_convert_json_to_jsonb(conn, "daily_reports", ["market_news"]))
+        results.append(_require_json_lists(conn, "report_stocks", [
+            "insider_activity", "risk_factors", "recent_news", "dark_horse_reasons",
+        ]))
+        results.append(_require_json_lists(conn, "daily_reports", ["market_news"]))
+        results.append(_apply_server_defaults(conn))
+        results.append(_create_trigram_indexes(conn))
+
+        if all(results):
+            conn.execute(
+                pg_insert(schema_migrations)
+                .values(version=SCHEMA_VERSION)
+                .on_conflict_do_nothing()
+            )
+            logger.info(f"Database schema migrated to version {SCHEMA_VERSION}")
 
 
 def init_db():
@@ -88,8 +342,18 @@ def init_db():
     from app.models import report, stock  # noqa: F401
     Base.metadata.create_all(bind=engine)
 
-    # Run migrations to add any missing columns
-    try:
-        run_migrations()
-    except Exception as e:
-        logger.warning(f"Migration failed (may be SQLite or already migrated): {e}")
+    # Migrations only apply to Postgres (see run_migrations)
+    if engine.dialect.name != "postgresql":
+        return
+
+    with engine.connect() as conn:
+        applied = conn.execute(
+            select(schema_migrations.c.version)
+            .where(schema_migrations.c.version == SCHEMA_VERSION)
+        ).first()
+    if applied:
+        return
+
+    # Individual steps already log and tolerate their own failures; anything
+    # that escapes is a real error and should stop startup
+    run_migrations()
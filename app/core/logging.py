@@ -0,0 +1,26 @@
+"""
+Logging setup shared by the web app, scheduler and one-shot commands.
+"""
+
+import logging
+
+from app.core.config import settings
+
+# Railway timestamps every line it collects, so production leaves out asctime
+# (and the strftime it costs on every record)
+_PRODUCTION_FORMAT = "%(name)s - %(levelname)s - %(message)s"
+_DEVELOPMENT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure root logging for this process (no-op if already configured)."""
+    # None of our formats use thread/process fields; skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        _PRODUCTION_FORMAT if settings.is_production else _DEVELOPMENT_FORMAT
+    ))
+    logging.basicConfig(level=level, handlers=[handler])
@@ -6,20 +6,20 @@ Main FastAPI application entry point.
 import logging
 from contextlib import asynccontextmanager
 
+from anyio import to_thread
 from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 
 from app.core.config import settings
 from app.core.database import init_db, get_db
+from app.core.logging import configure_logging
 from app.api.routes import router as api_router
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -28,12 +28,20 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     logger.info("Starting Stock Talk...")
-    try:
-        init_db()
-        logger.info("Database initialized")
-    except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
-        logger.warning("App will start but database features won't work until DATABASE_URL is configured")
+    # API routes are sync and run on anyio's worker threads, each holding a
+    # pooled connection while it works. Match the thread count to what the
+    # pool can hand out so requests don't stall in pool_timeout.
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    # Schema setup runs once per deploy via `python -m app.migrate`, not in every
+    # web worker. SQLite (local dev) has no deploy step, so create tables here.
+    if settings.database_url_sync.startswith("sqlite"):
+        try:
+            init_db()
+            logger.info("Database initialized")
+        except Exception as e:
+            logger.error(f"Database initialization failed: {e}")
     yield
     # Shutdown
     logger.info("Shutting down Stock Talk...")
@@ -46,6 +54,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Report payloads run to hundreds of KB of repetitive JSON; level 5 trades a
+# little ratio for noticeably less CPU than the default 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Get the directory where this file is located
 import os
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
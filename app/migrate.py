@@ -0,0 +1,30 @@
+"""
+One-shot database setup: create tables and apply migrations, then exit.
+
+Run before starting web servers (python -m app.migrate) so request-serving
+processes never contend for schema locks at boot.
+"""
+
+import logging
+import sys
+
+from app.core.database import init_db
+from app.core.logging import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    """Initialize the database schema."""
+    try:
+        init_db()
+    except Exception as e:
+        logger.error(f"Database initialization failed: {e}")
+        return 1
+    logger.info("Database initialized")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,15 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index, JSON, LargeBinary, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, relationship
 
-from app.core.database import Base
+from app.core.database import Base, utcnow
+
+# JSONB on Postgres (stored pre-parsed, so reads skip re-parsing text);
+# plain JSON elsewhere so SQLite keeps working
+JSONData = JSON().with_variant(JSONB(), "postgresql")
+
+# List-valued JSON columns default to an empty list rather than NULL
+EMPTY_JSON_LIST = text("'[]'")
 
 
 class DailyReport(Base):
@@ -19,7 +26,7 @@ class DailyReport(Base):
     nasdaq_change = Column(Float)
     dow_change = Column(Float)
     vix_level = Column(Float)
-    market_news = Column(JSON)  # [{title, summary, source, url}]
+    market_news = Column(JSONData, server_default=EMPTY_JSON_LIST, nullable=False)  # [{title, summary, source, url}]
 
     # Report metadata
     total_stocks_analyzed = Column(Integer)
@@ -29,18 +36,33 @@ class DailyReport(Base):
     tip_of_the_day_title = Column(String(255))
     tip_of_the_day_content = Column(Text)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
     # Relationships
-    stocks = relationship("ReportStock", back_populates="report", cascade="all, delete-orphan")
+    stocks = relationship(
+        "ReportStock",
+        back_populates="report",
+        cascade="all, delete-orphan",
+        order_by="ReportStock.rank",
+    )
+
+    __table_args__ = (
+        # Serves newest-first listing and the (report_date, id) keyset cursor
+        Index("ix_daily_reports_date_id", "report_date", "id"),
+    )
 
     def __repr__(self):
         return f"<DailyReport {self.report_date.strftime('%Y-%m-%d')}>"
 
 
 class ReportStock(Base):
-    """Individual stock entry within a daily report."""
+    """Individual stock entry within a daily report.
+
+    The large text/JSON columns are deferred in a "detail" group: they are
+    only needed to build a report's API rows, which are normally pre-encoded
+    in serialized_json.
+    """
 
     __tablename__ = "report_stocks"
 
@@ -103,7 +125,7 @@ class ReportStock(Base):
     sma_200 = Column(Float)
 
     # Company description
-    business_summary = Column(Text)
+    business_summary = deferred(Column(Text), group="detail")
 
     # 52-week range
     fifty_two_week_high = Column(Float)
@@ -124,22 +146,37 @@ class ReportStock(Base):
     sentiment_label = Column(String(20))  # Bearish, Mixed, Bullish
 
     # Insider activity (JSON for flexibility)
-    insider_activity = Column(JSON)  # [{"type": "buy", "amount": 1000000, "date": "2024-01-15", "role": "CEO"}]
+    # [{"type": "buy", "amount": 1000000, "date": "2024-01-15", "role": "CEO"}]
+    insider_activity = deferred(
+        Column(JSONData, server_default=EMPTY_JSON_LIST, nullable=False), group="detail"
+    )
 
     # Generated analysis
-    buy_case = Column(Text)  # Why it might be a good buy today
-    risk_factors = Column(JSON)  # ["Risk 1", "Risk 2", ...]
-    recent_news = Column(JSON)  # [{"title": "...", "source": "...", "date": "..."}]
+    buy_case = deferred(Column(Text), group="detail")  # Why it might be a good buy today
+    # ["Risk 1", "Risk 2", ...]
+    risk_factors = deferred(
+        Column(JSONData, server_default=EMPTY_JSON_LIST, nullable=False), group="detail"
+    )
+    # [{"title": "...", "source": "...", "date": "..."}]
+    recent_news = deferred(
+        Column(JSONData, server_default=EMPTY_JSON_LIST, nullable=False), group="detail"
+    )
 
     # Dark horse specific
-    dark_horse_reasons = Column(JSON)  # ["Low reddit mentions", "Under-followed by analysts", ...]
+    # ["Low reddit mentions", "Under-followed by analysts", ...]
+    dark_horse_reasons = deferred(
+        Column(JSONData, server_default=EMPTY_JSON_LIST, nullable=False), group="detail"
+    )
 
     # Signal summary
     bullish_signals = Column(Integer)  # Count of green flags
     bearish_signals = Column(Integer)  # Count of red flags
     neutral_signals = Column(Integer)  # Count of neutral indicators
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # API row (StockRow) pre-encoded as JSON when the report is generated
+    serialized_json = Column(LargeBinary)
+
+    created_at = Column(DateTime, server_default=utcnow())
 
     # Relationships
     report = relationship("DailyReport", back_populates="stocks")
@@ -147,6 +184,7 @@ class ReportStock(Base):
 
     __table_args__ = (
         Index("ix_report_stocks_report_rank", "report_id", "rank"),
+        Index("ix_report_stocks_stock_created", "stock_id", "created_at"),
     )
 
     def __repr__(self):
@@ -1,8 +1,7 @@
-from datetime import datetime
 from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
-from app.core.database import Base
+from app.core.database import Base, utcnow
 
 
 class Stock(Base):
@@ -17,8 +16,8 @@ class Stock(Base):
     industry = Column(String(100))
     market_cap = Column(Float)  # In billions
     market_cap_category = Column(String(20))  # small, mid, large, mega
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
 
     # Relationships
     mentions = relationship("StockMention", back_populates="stock", cascade="all, delete-orphan")
@@ -41,8 +40,8 @@ class StockMention(Base):
     post_title = Column(Text)
     mention_count = Column(Integer, default=1)
     sentiment_score = Column(Float)  # -1 to 1 scale
-    mentioned_at = Column(DateTime, default=datetime.utcnow)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    mentioned_at = Column(DateTime, server_default=utcnow())
+    created_at = Column(DateTime, server_default=utcnow())
 
     # Relationships
     stock = relationship("Stock", back_populates="mentions")
@@ -50,6 +49,9 @@ class StockMention(Base):
     __table_args__ = (
         Index("ix_stock_mentions_stock_date", "stock_id", "mentioned_at"),
         Index("ix_stock_mentions_subreddit", "subreddit"),
+        # Time-window scans across all stocks; mentions arrive roughly in
+        # mentioned_at order, which is what BRIN needs to stay tiny
+        Index("ix_stock_mentions_mentioned_at_brin", "mentioned_at", postgresql_using="brin"),
     )
 
 
@@ -116,7 +118,7 @@ class StockMetrics(Base):
     next_earnings_date = Column(DateTime)
     earnings_surprise_pct = Column(Float)  # Last earnings surprise
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
 
     # Relationships
     stock = relationship("Stock", back_populates="metrics")
@@ -138,7 +140,7 @@ class WatchlistStock(Base):
     ticker = Column(String(10), unique=True, nullable=False, index=True)
     notes = Column(Text)  # Optional notes about why it's on the watchlist
     priority = Column(Integer, default=0)  # Higher priority = analyzed first
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
 
     def __repr__(self):
         return f"<WatchlistStock {self.ticker}>"
@@ -10,23 +10,25 @@ allowing analysis of more stocks with full historical data.
 import logging
 import os
 import threading
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from zoneinfo import ZoneInfo
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import exists
 
 from app.core.config import settings
-from app.core.database import SessionLocal, init_db
+from app.core.database import SessionLocal, configure_engine, init_db
+from app.core.logging import configure_logging
 from app.services.report_generator import generate_daily_report
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# Reports are scheduled and dated in Pacific time
+PACIFIC = ZoneInfo("America/Los_Angeles")
+
 
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """Simple HTTP handler for healthcheck endpoint."""
@@ -56,8 +58,7 @@ def run_daily_report():
     logger.info("Starting scheduled daily report generation...")
 
     # Get Pacific time for logging
-    pacific = ZoneInfo("America/Los_Angeles")
-    current_time = datetime.now(pacific)
+    current_time = datetime.now(PACIFIC)
     logger.info(f"Current Pacific time: {current_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
 
     db = SessionLocal()
@@ -82,6 +83,10 @@ def main():
     health_thread = threading.Thread(target=start_health_server, daemon=True)
     health_thread.start()
 
+    # One job holds one session for minutes at a time, once a day: a small
+    # pool is plenty, and recycling replaces pre-ping's SELECT 1 per checkout
+    configure_engine(pool_size=2, max_overflow=2, pool_pre_ping=False, pool_recycle=1800)
+
     # Initialize database
     init_db()
     logger.info("Database initialized")
@@ -91,12 +96,10 @@ def main():
 
     # Schedule daily report at 9pm Pacific
     # CronTrigger uses the system timezone by default, so we specify Pacific
-    pacific = ZoneInfo("America/Los_Angeles")
-
     trigger = CronTrigger(
         hour=settings.REPORT_HOUR,  # 21 (9pm)
         minute=0,
-        timezone=pacific,
+        timezone=PACIFIC,
     )
 
     scheduler.add_job(
@@ -114,22 +117,23 @@ def main():
     # This helps when deploying or restarting
     try:
         from app.models import DailyReport
-        db = SessionLocal()
-        pacific = ZoneInfo("America/Los_Angeles")
-        today = datetime.now(pacific).date()
-
-        existing = db.query(DailyReport).filter(
-            DailyReport.report_date >= datetime.combine(today, datetime.min.time()),
-            DailyReport.report_date <= datetime.combine(today, datetime.max.time()),
-        ).first()
-
-        if not existing:
+        today = datetime.now(PACIFIC).date()
+        start_of_day = datetime.combine(today, time.min)
+
+        # EXISTS over a half-open [today, tomorrow) range stops at the first
+        # index hit; the session is closed before generation opens its own
+        with SessionLocal() as db:
+            has_report = db.query(
+                exists()
+                .where(DailyReport.report_date >= start_of_day)
+                .where(DailyReport.report_date < start_of_day + timedelta(days=1))
+            ).scalar()
+
+        if not has_report:
             logger.info("No report for today found, generating initial report...")
             run_daily_report()
         else:
             logger.info("Report for today already exists, skipping initial generation")
-
-        db.close()
     except Exception as e:
         logger.error(f"Error checking for existing report: {e}")
 
@@ -4,19 +4,57 @@ Free tier: 60 calls/minute, covers Reddit & Twitter sentiment.
 """
 
 import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 import time
 
 import httpx
+import numpy as np
+import orjson
 
+from app.core.cache import TTLCache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 FINNHUB_BASE_URL = "https://finnhub.io/api/v1"
 
+# Free tier quota
+CALLS_PER_MINUTE = 60
+
+# Retries after an HTTP 429 before a request gives up
+MAX_RETRIES = 5
+
+# Concurrent sentiment lookups in get_trending_stocks; request starts are
+# still metered by the rate limiter, this only overlaps the round-trips
+TRENDING_WORKERS = 16
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, if it gives a number."""
+    try:
+        return max(float(response.headers["Retry-After"]), 0.0)
+    except (KeyError, ValueError):
+        return None
+
+
+def _weighted_score(points: list[dict]) -> float:
+    """Mention-weighted mean score over a sentiment series.
+
+    Falls back to the latest point's score when no point has mentions.
+    """
+    mentions = np.array([p.get("mention", 0) or 0 for p in points], dtype=np.float64)
+    scores = np.array([p.get("score", 0.0) or 0.0 for p in points], dtype=np.float64)
+    total = mentions.sum()
+    if total <= 0:
+        return float(scores[-1])
+    return float(np.dot(mentions, scores) / total)
+
 
 @dataclass
 class SentimentData:
@@ -39,42 +77,93 @@ class FinnhubClient:
 
     def __init__(self):
         self.api_key = getattr(settings, 'FINNHUB_API_KEY', '') or ''
-        self.client = httpx.Client(timeout=30.0)
-        self._last_request_time = 0
-        self._min_request_interval = 0.02  # 50 requests/second max (staying under 60/min)
+        # HTTP/2 multiplexes the concurrent trending lookups over one TLS
+        # connection; fail fast on connect, allow slow bodies (stock/symbol)
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            headers={"Accept-Encoding": "gzip"},
+        )
+        # Token bucket: a full minute's quota can be spent at once, then
+        # tokens refill at CALLS_PER_MINUTE / 60 per second
+        self._tokens = float(CALLS_PER_MINUTE)
+        self._refill_rate = CALLS_PER_MINUTE / 60.0
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+
+        # Sentiment and buzz move a few times an hour, the symbol master daily.
+        # Failed lookups (None/empty) are not cached.
+        self._sentiment_cache = TTLCache(maxsize=4096, ttl=15 * 60)
+        self._buzz_cache = TTLCache(maxsize=1, ttl=5 * 60)
+        self._symbols_cache = TTLCache(maxsize=8, ttl=24 * 60 * 60)
+        self._search_cache = TTLCache(maxsize=1024, ttl=24 * 60 * 60)
+
+    def close(self):
+        """Close the underlying connection pool."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def _rate_limit(self):
-        """Simple rate limiting to stay under 60 calls/minute."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self._min_request_interval:
-            time.sleep(self._min_request_interval - elapsed)
-        self._last_request_time = time.time()
+        """Token-bucket rate limiting to stay under 60 calls/minute.
+
+        Thread-safe: each caller takes a token under the lock, letting the
+        balance go negative, then sleeps outside the lock until its token
+        would have refilled. Waiters are therefore served in arrival order.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(CALLS_PER_MINUTE),
+                self._tokens + (now - self._last_refill) * self._refill_rate,
+            )
+            self._last_refill = now
+            self._tokens -= 1
+            wait = -self._tokens / self._refill_rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
 
     def _make_request(self, endpoint: str, params: dict = None) -> Optional[dict]:
-        """Make a rate-limited request to Finnhub API."""
+        """Make a rate-limited request to Finnhub API.
+
+        On HTTP 429 retries up to MAX_RETRIES times, waiting for Retry-After
+        when given and exponential backoff with jitter otherwise.
+        """
         if not self.api_key:
             logger.warning("Finnhub API key not configured")
             return None
 
-        self._rate_limit()
-
         params = params or {}
         params["token"] = self.api_key
 
-        try:
-            response = self.client.get(f"{FINNHUB_BASE_URL}/{endpoint}", params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            if e.response.status_code == 429:
-                logger.warning("Finnhub rate limit hit, waiting...")
-                time.sleep(1)
-                return self._make_request(endpoint, params)
-            logger.error(f"Finnhub API error: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Finnhub request failed: {e}")
-            return None
+        for attempt in range(MAX_RETRIES + 1):
+            self._rate_limit()
+            try:
+                response = self.client.get(f"{FINNHUB_BASE_URL}/{endpoint}", params=params)
+                response.raise_for_status()
+                # orjson parses large payloads (stock/symbol is multi-MB) much
+                # faster than the stdlib json behind response.json()
+                return orjson.loads(response.content)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code != 429:
+                    logger.error("Finnhub API error: %s", e)
+                    return None
+                if attempt == MAX_RETRIES:
+                    logger.error("Finnhub rate limit hit, giving up on %s", endpoint)
+                    return None
+                delay = _retry_after(e.response)
+                if delay is None:
+                    delay = 2 ** attempt + random.uniform(0, 0.5)
+                logger.warning("Finnhub rate limit hit, retrying in %.1fs...", delay)
+                time.sleep(delay)
+            except Exception as e:
+                logger.error("Finnhub request failed: %s", e)
+                return None
 
     def get_social_sentiment(self, ticker: str) -> Optional[SentimentData]:
         """
@@ -86,6 +175,10 @@ class FinnhubClient:
         Returns:
             SentimentData object or None if failed
         """
+        cached = self._sentiment_cache.get(ticker)
+        if cached is not None:
+            return cached
+
         data = self._make_request("stock/social-sentiment", {"symbol": ticker})
 
         if not data:
@@ -93,24 +186,24 @@ class FinnhubClient:
 
         sentiment = SentimentData(ticker=ticker)
 
-        # Parse Reddit data
+        # Parse Reddit data: counts from the most recent data point, score
+        # smoothed over the whole series
         reddit_data = data.get("reddit", [])
         if reddit_data:
-            # Get most recent data point
-            latest = reddit_data[-1] if reddit_data else {}
+            latest = reddit_data[-1]
             sentiment.reddit_mentions = latest.get("mention", 0)
             sentiment.reddit_positive = latest.get("positiveMention", 0)
             sentiment.reddit_negative = latest.get("negativeMention", 0)
-            sentiment.reddit_score = latest.get("score", 0.0)
+            sentiment.reddit_score = _weighted_score(reddit_data)
 
         # Parse Twitter data
         twitter_data = data.get("twitter", [])
         if twitter_data:
-            latest = twitter_data[-1] if twitter_data else {}
+            latest = twitter_data[-1]
             sentiment.twitter_mentions = latest.get("mention", 0)
             sentiment.twitter_positive = latest.get("positiveMention", 0)
             sentiment.twitter_negative = latest.get("negativeMention", 0)
-            sentiment.twitter_score = latest.get("score", 0.0)
+            sentiment.twitter_score = _weighted_score(twitter_data)
 
         # Calculate totals
         sentiment.total_mentions = sentiment.reddit_mentions + sentiment.twitter_mentions
@@ -123,6 +216,7 @@ class FinnhubClient:
                 sentiment.twitter_score * twitter_weight
             )
 
+        self._sentiment_cache.set(ticker, sentiment)
         return sentiment
 
     def get_stock_symbols(self, exchange: str = "US") -> list[dict]:
@@ -135,6 +229,10 @@ class FinnhubClient:
         Returns:
             List of stock dictionaries with symbol, name, type, etc.
         """
+        cached = self._symbols_cache.get(exchange)
+        if cached is not None:
+            return cached
+
         data = self._make_request("stock/symbol", {"exchange": exchange})
         if not data:
             return []
@@ -145,7 +243,9 @@ class FinnhubClient:
             if s.get("type") == "Common Stock"
         ]
 
-        logger.info(f"Found {len(stocks)} common stocks on {exchange} exchange")
+        logger.info("Found %d common stocks on %s exchange", len(stocks), exchange)
+        if stocks:
+            self._symbols_cache.set(exchange, stocks)
         return stocks
 
     def get_buzz_stocks(self) -> list[str]:
@@ -156,6 +256,10 @@ class FinnhubClient:
         Returns:
             List of ticker symbols with high buzz
         """
+        cached = self._buzz_cache.get("buzz")
+        if cached is not None:
+            return cached
+
         data = self._make_request("stock/social-sentiment/buzz")
 
         if not data or "buzz" not in data:
@@ -165,7 +269,10 @@ class FinnhubClient:
         buzz_list = data.get("buzz", [])
         sorted_buzz = sorted(buzz_list, key=lambda x: x.get("buzz", 0), reverse=True)
 
-        return [item.get("symbol") for item in sorted_buzz[:100] if item.get("symbol")]
+        tickers = [item.get("symbol") for item in sorted_buzz[:100] if item.get("symbol")]
+        if tickers:
+            self._buzz_cache.set("buzz", tickers)
+        return tickers
 
     def search_symbol(self, query: str) -> list[dict]:
         """
@@ -177,11 +284,21 @@ class FinnhubClient:
         Returns:
             List of matching stocks
         """
-        data = self._make_request("search", {"q": query})
+        # "Apple Inc", "apple inc " and "APPLE  INC" are the same search
+        key = " ".join(query.casefold().split())
+        if not key:
+            return []
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        data = self._make_request("search", {"q": key})
         if not data:
             return []
 
-        return data.get("result", [])
+        results = data.get("result", [])
+        self._search_cache.set(key, results)
+        return results
 
     def get_trending_stocks(self, limit: int = 50) -> list[dict]:
         """
@@ -201,9 +318,12 @@ class FinnhubClient:
             logger.warning("No buzz data available from Finnhub")
             return []
 
+        # Lookups are I/O-bound, so overlap them; map() keeps buzz order
+        with ThreadPoolExecutor(max_workers=TRENDING_WORKERS) as pool:
+            sentiments = list(pool.map(self.get_social_sentiment, buzz_tickers[:limit]))
+
         trending = []
-        for ticker in buzz_tickers[:limit]:
-            sentiment = self.get_social_sentiment(ticker)
+        for ticker, sentiment in zip(buzz_tickers[:limit], sentiments):
             if sentiment and sentiment.total_mentions > 0:
                 trending.append({
                     "ticker": ticker,
@@ -218,9 +338,11 @@ class FinnhubClient:
         # Sort by total mentions
         trending.sort(key=lambda x: x["total_mentions"], reverse=True)
 
-        logger.info(f"Found {len(trending)} trending stocks with sentiment data")
+        logger.info("Found %d trending stocks with sentiment data", len(trending))
         return trending
 
 
-# Singleton instance
-finnhub_client = FinnhubClient()
+@lru_cache
+def get_finnhub_client() -> FinnhubClient:
+    """Shared client, created on first use so importing this module opens no connections."""
+    return FinnhubClient()
@@ -5,15 +5,29 @@ to provide context for the daily stock report.
 """
 
 import logging
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from typing import Optional
 
+import pandas as pd
 import yfinance as yf
 
+from app.core.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+SP500 = "^GSPC"
+NASDAQ = "^IXIC"
+DOW = "^DJI"
+VIX = "^VIX"
+INDEX_SYMBOLS = [SP500, NASDAQ, DOW, VIX]
+
+# Repeated report builds within these windows reuse Yahoo's last answer
+_indices_cache = TTLCache(maxsize=1, ttl=60)
+_news_cache = TTLCache(maxsize=1, ttl=10 * 60)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketContext:
     """Market context data for the daily report."""
     sp500_change: Optional[float] = None
@@ -21,7 +35,7 @@ class MarketContext:
     dow_change: Optional[float] = None
     vix_level: Optional[float] = None
     market_summary: str = ""
-    market_news: list = field(default_factory=list)
+    market_news: tuple[dict, ...] = ()
 
 
 def fetch_market_context() -> MarketContext:
@@ -31,59 +45,97 @@ def fetch_market_context() -> MarketContext:
     Returns:
         MarketContext with index changes and news items
     """
-    ctx = MarketContext()
-
-    # Fetch major index daily changes
-    ctx.sp500_change = _get_index_change("^GSPC")
-    ctx.nasdaq_change = _get_index_change("^IXIC")
-    ctx.dow_change = _get_index_change("^DJI")
-    ctx.vix_level = _get_vix_level()
-
-    # Build a short summary from the data
-    ctx.market_summary = _build_summary(ctx)
-
-    # Fetch top market news via yfinance
-    ctx.market_news = _fetch_market_news()
-
-    logger.info(
-        f"Market context: S&P {ctx.sp500_change:+.2f}%, "
-        f"Nasdaq {ctx.nasdaq_change:+.2f}%, "
-        f"Dow {ctx.dow_change:+.2f}%, "
-        f"VIX {ctx.vix_level:.1f}, "
-        f"{len(ctx.market_news)} news items"
-        if ctx.sp500_change is not None else "Market context: partial data"
+    # Fetch major index daily changes (one batched download for all four)
+    closes = _fetch_indices()
+    ctx = MarketContext(
+        sp500_change=_get_index_change(closes.get(SP500)),
+        nasdaq_change=_get_index_change(closes.get(NASDAQ)),
+        dow_change=_get_index_change(closes.get(DOW)),
+        vix_level=_get_vix_level(closes.get(VIX)),
+    )
+
+    ctx = replace(
+        ctx,
+        # Build a short summary from the data
+        market_summary=_build_summary(ctx),
+        # Fetch top market news via yfinance
+        market_news=_fetch_market_news(),
     )
 
+    # Any index may be missing, so format each one (and only if logging)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Market context: S&P %s, Nasdaq %s, Dow %s, VIX %s, %d news items",
+            _format_value(ctx.sp500_change, "{:+.2f}%"),
+            _format_value(ctx.nasdaq_change, "{:+.2f}%"),
+            _format_value(ctx.dow_change, "{:+.2f}%"),
+            _format_value(ctx.vix_level, "{:.1f}"),
+            len(ctx.market_news),
+        )
+
     return ctx
 
 
-def _get_index_change(symbol: str) -> Optional[float]:
-    """Get the daily percentage change for a market index."""
+def _fetch_indices() -> dict[str, pd.Series]:
+    """Fetch recent daily closes for every index in one request.
+
+    Returns a {symbol: closes} dict; symbols that failed to download are
+    missing, and an empty dict is returned if the whole batch failed.
+    Successful results are cached for a minute.
+    """
+    cached = _indices_cache.get("closes")
+    if cached is not None:
+        return cached
+
     try:
-        ticker = yf.Ticker(symbol)
-        hist = ticker.history(period="5d")
-        if hist is not None and len(hist) >= 2:
-            prev_close = float(hist["Close"].iloc[-2])
-            current = float(hist["Close"].iloc[-1])
-            if prev_close > 0:
-                return round(((current - prev_close) / prev_close) * 100, 2)
+        data = yf.download(
+            INDEX_SYMBOLS,
+            period="5d",
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+        )
     except Exception as e:
-        logger.warning(f"Failed to get change for {symbol}: {e}")
+        logger.warning("Failed to download index history: %s", e)
+        return {}
+
+    closes = {}
+    if data is None or data.empty:
+        return closes
+    for symbol in INDEX_SYMBOLS:
+        if symbol in data.columns.get_level_values(0):
+            # Indices trade on slightly different calendars; drop the gaps
+            series = data[symbol]["Close"].dropna()
+            if not series.empty:
+                closes[symbol] = series
+    if closes:
+        _indices_cache.set("closes", closes)
+    return closes
+
+
+def _get_index_change(closes: Optional[pd.Series]) -> Optional[float]:
+    """Get the daily percentage change from an index's recent closes."""
+    if closes is not None and len(closes) >= 2:
+        prev_close = float(closes.iloc[-2])
+        current = float(closes.iloc[-1])
+        if prev_close > 0:
+            return round(((current - prev_close) / prev_close) * 100, 2)
     return None
 
 
-def _get_vix_level() -> Optional[float]:
-    """Get the current VIX level."""
-    try:
-        ticker = yf.Ticker("^VIX")
-        hist = ticker.history(period="1d")
-        if hist is not None and not hist.empty:
-            return round(float(hist["Close"].iloc[-1]), 1)
-    except Exception as e:
-        logger.warning(f"Failed to get VIX: {e}")
+def _get_vix_level(closes: Optional[pd.Series]) -> Optional[float]:
+    """Get the current VIX level from its recent closes."""
+    if closes is not None and not closes.empty:
+        return round(float(closes.iloc[-1]), 1)
     return None
 
 
+def _format_value(value: Optional[float], spec: str) -> str:
+    """Format an optional market figure for logging."""
+    return spec.format(value) if value is not None else "n/a"
+
+
 def _build_summary(ctx: MarketContext) -> str:
     """Build a one-line market summary from index data."""
     parts = []
@@ -112,46 +164,68 @@ def _build_summary(ctx: MarketContext) -> str:
     return ". ".join(parts) + "."
 
 
-def _fetch_market_news() -> list[dict]:
+def _fetch_market_news() -> tuple[dict, ...]:
     """
     Fetch top market news headlines via yfinance.
     Uses the S&P 500 ticker as a proxy for broad market news.
-    Returns up to 3 news items.
+    Returns up to 3 news items, cached for ten minutes.
     """
-    news_items = []
+    cached = _news_cache.get("news")
+    if cached is not None:
+        return cached
 
-    # Try multiple tickers to get diverse market news
-    for symbol in ["^GSPC", "^IXIC", "SPY"]:
-        try:
-            ticker = yf.Ticker(symbol)
-            news = ticker.news
-            if not news:
-                continue
-
-            for item in news:
-                title = item.get("title", "")
-                link = item.get("link", "")
-                publisher = item.get("publisher", "")
+    news_items = []
+    seen_titles = set()
 
-                # Skip duplicates by title
-                if any(n["title"] == title for n in news_items):
+    # Try multiple tickers to get diverse market news. Fetch them all at once,
+    # but read results in this order so the S&P 500 headlines still win.
+    symbols = [SP500, NASDAQ, "SPY"]
+    executor = ThreadPoolExecutor(max_workers=len(symbols))
+    futures = [executor.submit(_get_ticker_news, symbol) for symbol in symbols]
+    try:
+        for symbol, future in zip(symbols, futures):
+            try:
+                news = future.result()
+                if not news:
                     continue
 
-                if title and link:
-                    news_items.append({
-                        "title": title,
-                        "source": publisher,
-                        "url": link,
-                    })
+                for item in news:
+                    title = item.get("title", "")
+                    link = item.get("link", "")
+                    publisher = item.get("publisher", "")
+
+                    # Skip duplicates by title, ignoring case and spacing
+                    title_key = " ".join(title.casefold().split())
+                    if title_key in seen_titles:
+                        continue
+
+                    if title and link:
+                        seen_titles.add(title_key)
+                        news_items.append({
+                            "title": title,
+                            "source": publisher,
+                            "url": link,
+                        })
+
+                    if len(news_items) >= 3:
+                        break
+
+            except Exception as e:
+                logger.debug("Error fetching news for %s: %s", symbol, e)
+                continue
 
-                if len(news_items) >= 3:
-                    break
+            if len(news_items) >= 3:
+                break
+    finally:
+        # Don't wait on fetches whose headlines are no longer needed
+        executor.shutdown(wait=False, cancel_futures=True)
 
-        except Exception as e:
-            logger.debug(f"Error fetching news for {symbol}: {e}")
-            continue
+    news_items = tuple(news_items[:3])
+    if news_items:
+        _news_cache.set("news", news_items)
+    return news_items
 
-        if len(news_items) >= 3:
-            break
 
-    return news_items[:3]
+def _get_ticker_news(symbol: str) -> list:
+    """Get raw yfinance news items for a ticker."""
+    return yf.Ticker(symbol).news
@@ -3,78 +3,239 @@ Report generator that combines Reddit mentions and stock data
 to create daily value stock analysis reports.
 """
 
+import heapq
 import logging
 import random
+import re
 from datetime import datetime
 from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from types import SimpleNamespace
 from typing import Optional
 
+import numpy as np
+from sqlalchemy import Float, Integer, insert
 from sqlalchemy.orm import Session
 
+from app.api.responses import dumps
+from app.api.schemas import build_stock_row
 from app.core.config import settings
 from app.models import DailyReport, ReportStock, Stock, StockMention, StockMetrics
-from app.services.reddit_scraper import reddit_scraper, StockMentionData, get_fallback_mentions
+from app.services.reddit_scraper import get_reddit_scraper, StockMentionData, get_fallback_mentions
 from app.services.stock_fetcher import stock_fetcher, StockData
-from app.services.finnhub_client import finnhub_client
 from app.services.market_context import fetch_market_context
 
 logger = logging.getLogger(__name__)
 
 
-# Investment tips for the "tip of the day" feature
-INVESTMENT_TIPS = [
-    {
-        "title": "P/E Ratio Basics",
-        "content": "The P/E (Price-to-Earnings) ratio shows how much you're paying for each dollar of a company's profit. A P/E of 20 means you pay $20 for every $1 of earnings. Lower P/E can mean undervalued, but could also signal problems. Always compare to the sector average."
-    },
-    {
-        "title": "What Free Cash Flow Tells You",
-        "content": "Free Cash Flow (FCF) is the actual cash a company generates after expenses. Unlike earnings, it's hard to manipulate. Positive FCF means the company can pay dividends, buy back stock, or invest in growth without taking on debt."
-    },
-    {
-        "title": "Understanding RSI",
-        "content": "RSI (Relative Strength Index) measures momentum on a 0-100 scale. Below 30 is considered 'oversold' (potentially a buying opportunity), above 70 is 'overbought' (might be due for a pullback). It's not a guarantee—just one signal among many."
-    },
-    {
-        "title": "Debt-to-Equity Explained",
-        "content": "Debt-to-Equity shows how much debt a company uses compared to shareholder equity. Under 1.0 is generally healthy. High D/E isn't always bad (utilities often run higher), but during tough times, heavily indebted companies struggle more."
-    },
-    {
-        "title": "Why Insider Buying Matters",
-        "content": "When executives buy their own company's stock with personal money, it's often a bullish signal—they have inside knowledge and are betting on success. Selling is less meaningful (they might just need cash), but unusual buying patterns are worth noting."
-    },
-    {
-        "title": "The PEG Ratio Advantage",
-        "content": "PEG adjusts P/E for growth rate. A P/E of 30 sounds expensive, but if earnings grow 30% yearly, the PEG is 1.0 (fairly valued). Under 1.0 often suggests you're getting growth at a discount."
-    },
-    {
-        "title": "Short Interest as a Contrarian Signal",
-        "content": "High short interest means many investors are betting against a stock. If the company proves them wrong, shorts must buy to cover, driving prices up fast (a 'short squeeze'). But high shorts can also mean real problems—do your research."
-    },
-    {
-        "title": "52-Week Range Context",
-        "content": "A stock near its 52-week low isn't automatically a bargain—it might be falling for good reasons. But combined with strong fundamentals, it could signal a value opportunity. Check why it's down before buying."
-    },
-    {
-        "title": "Institutional Ownership Sweet Spot",
-        "content": "High institutional ownership (60%+) means professionals believe in it, adding stability. Very low (<20%) could mean undiscovered value or red flags. The sweet spot is often 40-70%: validated but not overcrowded."
-    },
-    {
-        "title": "Earnings Dates Matter",
-        "content": "Stock prices often swing wildly around earnings reports. If you buy just before earnings, you're essentially gambling on the results. Some prefer buying after earnings settle, even if they miss the initial pop."
-    },
-    {
-        "title": "Price-to-Book for Value Hunters",
-        "content": "P/B ratio compares stock price to the company's book value (assets minus liabilities). Under 1.0 means you could theoretically buy the company for less than its assets are worth. Common in banks and insurance—less useful for tech."
-    },
-    {
-        "title": "The Dividend Yield Trade-off",
-        "content": "High dividend yields are attractive but can be a trap. If a stock drops 50%, its yield doubles—but that high yield reflects distress, not generosity. Look for consistent dividend growth, not just high current yields."
-    },
-]
-
-
-@dataclass
+# Investment tips for the "tip of the day" feature, as (title, content)
+INVESTMENT_TIPS: tuple[tuple[str, str], ...] = (
+    (
+        "P/E Ratio Basics",
+        "The P/E (Price-to-Earnings) ratio shows how much you're paying for each dollar of a company's profit. A P/E of 20 means you pay $20 for every $1 of earnings. Lower P/E can mean undervalued, but could also signal problems. Always compare to the sector average.",
+    ),
+    (
+        "What Free Cash Flow Tells You",
+        "Free Cash Flow (FCF) is the actual cash a company generates after expenses. Unlike earnings, it's hard to manipulate. Positive FCF means the company can pay dividends, buy back stock, or invest in growth without taking on debt.",
+    ),
+    (
+        "Understanding RSI",
+        "RSI (Relative Strength Index) measures momentum on a 0-100 scale. Below 30 is considered 'oversold' (potentially a buying opportunity), above 70 is 'overbought' (might be due for a pullback). It's not a guarantee—just one signal among many.",
+    ),
+    (
+        "Debt-to-Equity Explained",
+        "Debt-to-Equity shows how much debt a company uses compared to shareholder equity. Under 1.0 is generally healthy. High D/E isn't always bad (utilities often run higher), but during tough times, heavily indebted companies struggle more.",
+    ),
+    (
+        "Why Insider Buying Matters",
+        "When executives buy their own company's stock with personal money, it's often a bullish signal—they have inside knowledge and are betting on success. Selling is less meaningful (they might just need cash), but unusual buying patterns are worth noting.",
+    ),
+    (
+        "The PEG Ratio Advantage",
+        "PEG adjusts P/E for growth rate. A P/E of 30 sounds expensive, but if earnings grow 30% yearly, the PEG is 1.0 (fairly valued). Under 1.0 often suggests you're getting growth at a discount.",
+    ),
+    (
+        "Short Interest as a Contrarian Signal",
+        "High short interest means many investors are betting against a stock. If the company proves them wrong, shorts must buy to cover, driving prices up fast (a 'short squeeze'). But high shorts can also mean real problems—do your research.",
+    ),
+    (
+        "52-Week Range Context",
+        "A stock near its 52-week low isn't automatically a bargain—it might be falling for good reasons. But combined with strong fundamentals, it could signal a value opportunity. Check why it's down before buying.",
+    ),
+    (
+        "Institutional Ownership Sweet Spot",
+        "High institutional ownership (60%+) means professionals believe in it, adding stability. Very low (<20%) could mean undiscovered value or red flags. The sweet spot is often 40-70%: validated but not overcrowded.",
+    ),
+    (
+        "Earnings Dates Matter",
+        "Stock prices often swing wildly around earnings reports. If you buy just before earnings, you're essentially gambling on the results. Some prefer buying after earnings settle, even if they miss the initial pop.",
+    ),
+    (
+        "Price-to-Book for Value Hunters",
+        "P/B ratio compares stock price to the company's book value (assets minus liabilities). Under 1.0 means you could theoretically buy the company for less than its assets are worth. Common in banks and insurance—less useful for tech.",
+    ),
+    (
+        "The Dividend Yield Trade-off",
+        "High dividend yields are attractive but can be a trap. If a stock drops 50%, its yield doubles—but that high yield reflects distress, not generosity. Look for consistent dividend growth, not just high current yields.",
+    ),
+)
+
+
+# Focus-sector keywords, matched as plain substrings of the lowercased
+# sector/industry (note the trailing space in "ai ")
+AI_KEYWORDS_RE = re.compile("artificial intelligence|machine learning|ai |neural|data")
+TECH_KEYWORDS_RE = re.compile("technology|software|semiconductor|internet|computer")
+MEDICAL_KEYWORDS_RE = re.compile("health|medical|biotech|pharma|drug|therapeutic")
+INTL_KEYWORDS_RE = re.compile("adr|international|global|foreign")
+
+
+@lru_cache(maxsize=512)
+def _categorize_sector(sector: str, industry: str) -> str:
+    """Categorize stock into one of our focus sectors.
+
+    Cached: a report only ever sees a few dozen (sector, industry) pairs.
+    """
+    sector_lower = sector.lower()
+    industry_lower = industry.lower()
+
+    # Tech/AI detection
+    if AI_KEYWORDS_RE.search(industry_lower):
+        return "ai"
+    if TECH_KEYWORDS_RE.search(sector_lower) or TECH_KEYWORDS_RE.search(industry_lower):
+        return "tech"
+
+    # Medical/Healthcare
+    if MEDICAL_KEYWORDS_RE.search(sector_lower) or MEDICAL_KEYWORDS_RE.search(industry_lower):
+        return "medical"
+
+    # International (harder to detect, would need country data)
+    # For now, check for ADR or international keywords
+    if INTL_KEYWORDS_RE.search(industry_lower):
+        return "international"
+
+    return "other"
+
+
+# ReportStock numeric columns, coerced to the type the database stores so
+# pre-encoded rows match what build_stock_row produces from a loaded row
+_REPORT_STOCK_COERCIONS = tuple(
+    (column.name, float if isinstance(column.type, Float) else int)
+    for column in ReportStock.__table__.columns
+    if isinstance(column.type, (Float, Integer))
+)
+
+
+def _coerce_report_stock_row(row: dict) -> None:
+    """Convert a ReportStock insert dict's numeric values in place (e.g. 0 -> 0.0)."""
+    for name, coerce in _REPORT_STOCK_COERCIONS:
+        value = row.get(name)
+        if value is not None:
+            row[name] = coerce(value)
+
+
+@dataclass(frozen=True, slots=True)
+class InsiderSummary:
+    """Counts and total values of a stock's recent insider buys and sells."""
+
+    buy_count: int = 0
+    sell_count: int = 0
+    buy_value: float = 0
+    sell_value: float = 0
+
+
+def _summarize_insiders(activity: list[dict]) -> InsiderSummary:
+    """Summarize insider transactions in a single pass."""
+    buy_count = sell_count = 0
+    buy_value = sell_value = 0
+    for transaction in activity:
+        transaction_type = transaction.get("type")
+        if transaction_type == "buy":
+            buy_count += 1
+            buy_value += transaction.get("value", 0)
+        elif transaction_type == "sell":
+            sell_count += 1
+            sell_value += transaction.get("value", 0)
+    return InsiderSummary(buy_count, sell_count, buy_value, sell_value)
+
+
+def _target_upside(stock: StockData) -> Optional[float]:
+    """Percent upside from the current price to the mean analyst target."""
+    if stock.target_price_mean and stock.current_price and stock.current_price > 0:
+        return ((stock.target_price_mean - stock.current_price) / stock.current_price) * 100
+    return None
+
+
+def _metric_array(stocks: list[StockData], name: str) -> np.ndarray:
+    """One metric across stocks, with missing (None or 0) values as NaN."""
+    return np.array([getattr(s, name) or np.nan for s in stocks], dtype=np.float64)
+
+
+def _calculate_scores(
+    stocks: list[StockData],
+    reddit_mentions: list[int],
+    sentiments: list[float],
+    insiders: list[InsiderSummary],
+    upsides: list[Optional[float]],
+) -> list[float]:
+    """
+    Calculate a composite score for ranking each stock.
+    Higher score = more attractive value opportunity.
+
+    Scores the whole batch with array ops. Missing metrics are NaN, and any
+    comparison against NaN is False, so they earn no points.
+    """
+    pct_ath = _metric_array(stocks, "pct_from_ath")
+    rsi = _metric_array(stocks, "rsi")
+    pe = _metric_array(stocks, "pe_ratio")
+    peg = _metric_array(stocks, "peg_ratio")
+    debt = _metric_array(stocks, "debt_to_equity")
+    fcf = _metric_array(stocks, "free_cash_flow")
+    mentions = np.array(reddit_mentions, dtype=np.float64)
+    sentiment = np.array(sentiments, dtype=np.float64)
+    has_insider_buys = np.array([i.buy_count > 0 for i in insiders], dtype=bool)
+    upside = np.array([np.nan if u is None else u for u in upsides], dtype=np.float64)
+
+    # Each tier adds bonus * mask, so every comparison runs for every stock
+    # and tiers are written as disjoint ranges instead of if/elif chains
+    score = np.zeros(len(stocks))
+
+    # Price drop from ATH (more drop = higher score, up to a point).
+    # fmin ignores NaN, so a missing value contributes 40 * 1.5 * False = 0
+    score += np.fmin(pct_ath, 40) * 1.5 * ((pct_ath >= 15) & (pct_ath <= 50))  # Max 60 points
+    score += 40 * (pct_ath > 50)  # Cap it—might be falling knife
+
+    # Reddit mentions (moderate mentions preferred)
+    score += 20 * ((mentions >= 10) & (mentions <= 100)) + 10 * (mentions > 100)
+
+    # Sentiment bonus
+    score += 15 * (sentiment > 0.3) + 10 * ((sentiment > 0) & (sentiment <= 0.3))
+
+    # RSI oversold bonus
+    score += 25 * (rsi < 30) + 15 * ((rsi >= 30) & (rsi < 40))
+
+    # P/E value (lower is better, but not too low)
+    score += 20 * ((pe > 5) & (pe < 15)) + 10 * ((pe >= 15) & (pe < 25))
+
+    # PEG under 1 is attractive
+    score += 20 * (peg < 1)
+
+    # Low debt is good
+    score += 15 * (debt < 0.5) + 10 * ((debt >= 0.5) & (debt < 1.0))
+
+    # Positive free cash flow
+    score += 15 * (fcf > 0)
+
+    # Insider buying (check for recent buys)
+    score += 20 * has_insider_buys
+
+    # Analyst upside
+    score += 20 * (upside > 30) + 10 * ((upside > 15) & (upside <= 30))
+
+    return np.round(score, 2).tolist()
+
+
+@dataclass(slots=True)
 class AnalyzedStock:
     """Stock with complete analysis for report."""
 
@@ -88,6 +249,8 @@ class AnalyzedStock:
     score: float = 0.0
     is_dark_horse: bool = False
     sector_category: str = ""
+    insiders: InsiderSummary = InsiderSummary()
+    upside_pct: Optional[float] = None
     buy_case: str = ""
     risk_factors: list = field(default_factory=list)
     dark_horse_reasons: list = field(default_factory=list)
@@ -103,102 +266,9 @@ class ReportGenerator:
         self.db = db
         self.max_stocks = max_stocks or settings.MAX_STOCKS_WEB
 
-    def _categorize_sector(self, sector: str, industry: str) -> str:
-        """Categorize stock into one of our focus sectors."""
-        sector_lower = sector.lower()
-        industry_lower = industry.lower()
-
-        # Tech/AI detection
-        tech_keywords = ["technology", "software", "semiconductor", "internet", "computer"]
-        ai_keywords = ["artificial intelligence", "machine learning", "ai ", "neural", "data"]
-
-        if any(kw in industry_lower for kw in ai_keywords):
-            return "ai"
-        if any(kw in sector_lower or kw in industry_lower for kw in tech_keywords):
-            return "tech"
-
-        # Medical/Healthcare
-        medical_keywords = ["health", "medical", "biotech", "pharma", "drug", "therapeutic"]
-        if any(kw in sector_lower or kw in industry_lower for kw in medical_keywords):
-            return "medical"
-
-        # International (harder to detect, would need country data)
-        # For now, check for ADR or international keywords
-        intl_keywords = ["adr", "international", "global", "foreign"]
-        if any(kw in industry_lower for kw in intl_keywords):
-            return "international"
-
-        return "other"
-
-    def _calculate_score(self, stock: StockData, reddit_mentions: int, sentiment: float) -> float:
-        """
-        Calculate a composite score for ranking stocks.
-        Higher score = more attractive value opportunity.
-        """
-        score = 0.0
-
-        # Price drop from ATH (more drop = higher score, up to a point)
-        if stock.pct_from_ath:
-            if 15 <= stock.pct_from_ath <= 50:
-                score += min(stock.pct_from_ath, 40) * 1.5  # Max 60 points
-            elif stock.pct_from_ath > 50:
-                score += 40  # Cap it—might be falling knife
-
-        # Reddit mentions (moderate mentions preferred)
-        if 10 <= reddit_mentions <= 100:
-            score += 20
-        elif reddit_mentions > 100:
-            score += 10  # Still good, but crowded
-
-        # Sentiment bonus
-        if sentiment > 0.3:
-            score += 15
-        elif sentiment > 0:
-            score += 10
-
-        # RSI oversold bonus
-        if stock.rsi and stock.rsi < 30:
-            score += 25
-        elif stock.rsi and stock.rsi < 40:
-            score += 15
-
-        # P/E value (lower is better, but not too low)
-        if stock.pe_ratio:
-            if 5 < stock.pe_ratio < 15:
-                score += 20
-            elif 15 <= stock.pe_ratio < 25:
-                score += 10
-
-        # PEG under 1 is attractive
-        if stock.peg_ratio and stock.peg_ratio < 1:
-            score += 20
-
-        # Low debt is good
-        if stock.debt_to_equity and stock.debt_to_equity < 0.5:
-            score += 15
-        elif stock.debt_to_equity and stock.debt_to_equity < 1.0:
-            score += 10
-
-        # Positive free cash flow
-        if stock.free_cash_flow and stock.free_cash_flow > 0:
-            score += 15
-
-        # Insider buying (check for recent buys)
-        recent_buys = [a for a in stock.insider_activity if a.get("type") == "buy"]
-        if recent_buys:
-            score += 20
-
-        # Analyst upside
-        if stock.target_price_mean and stock.current_price:
-            upside = ((stock.target_price_mean - stock.current_price) / stock.current_price) * 100
-            if upside > 30:
-                score += 20
-            elif upside > 15:
-                score += 10
-
-        return round(score, 2)
-
-    def _count_signals(self, stock: StockData) -> tuple[int, int, int]:
+    def _count_signals(
+        self, stock: StockData, insiders: InsiderSummary
+    ) -> tuple[int, int, int]:
         """Count bullish, bearish, and neutral signals."""
         bullish = 0
         bearish = 0
@@ -257,11 +327,9 @@ class ReportGenerator:
                 neutral += 1
 
         # Insider activity
-        recent_buys = [a for a in stock.insider_activity if a.get("type") == "buy"]
-        recent_sells = [a for a in stock.insider_activity if a.get("type") == "sell"]
-        if len(recent_buys) > len(recent_sells):
+        if insiders.buy_count > insiders.sell_count:
             bullish += 1
-        elif len(recent_sells) > len(recent_buys):
+        elif insiders.sell_count > insiders.buy_count:
             bearish += 1
 
         # 1-year return
@@ -273,7 +341,13 @@ class ReportGenerator:
 
         return bullish, bearish, neutral
 
-    def _generate_buy_case(self, stock: StockData, reddit_mentions: int, sentiment: float) -> str:
+    def _generate_buy_case(
+        self,
+        stock: StockData,
+        sentiment: float,
+        insiders: InsiderSummary,
+        upside: Optional[float],
+    ) -> str:
         """Generate a data-specific explanation of why this stock might be a buy.
         Points are weighted by conviction strength and sorted by importance."""
         # (weight, text) — higher weight = stronger signal
@@ -331,17 +405,15 @@ class ReportGenerator:
             weighted_points.append((40, f"Manageable debt levels (D/E {stock.debt_to_equity:.2f}) provide financial flexibility"))
 
         # --- Insider & institutional signals ---
-        recent_buys = [a for a in stock.insider_activity if a.get("type") == "buy"]
-        if recent_buys:
-            total_value = sum(a.get("value", 0) for a in recent_buys)
+        if insiders.buy_count:
+            total_value = insiders.buy_value
             if total_value > 1_000_000:
                 weighted_points.append((85, f"Insiders bought ${total_value/1e6:.1f}M recently—executives putting their own money on the line"))
             elif total_value > 0:
                 weighted_points.append((65, f"Recent insider buying worth ${total_value/1e3:.0f}K signals management confidence"))
 
         # --- Analyst consensus ---
-        if stock.target_price_mean and stock.current_price and stock.current_price > 0:
-            upside = ((stock.target_price_mean - stock.current_price) / stock.current_price) * 100
+        if upside is not None:
             if upside > 40 and stock.analyst_count and stock.analyst_count >= 10:
                 weighted_points.append((80, f"{stock.analyst_count} analysts see {upside:.0f}% upside to ${stock.target_price_mean:.0f}—strong Wall Street consensus"))
             elif upside > 20 and stock.analyst_count and stock.analyst_count >= 5:
@@ -365,7 +437,7 @@ class ReportGenerator:
             weighted_points.append((30, "Positive Reddit sentiment suggests retail investor interest"))
 
         # Sort by weight descending, take top 4
-        weighted_points.sort(key=lambda x: x[0], reverse=True)
+        weighted_points.sort(key=itemgetter(0), reverse=True)
         points = [text for _, text in weighted_points[:4]]
 
         if not points:
@@ -384,7 +456,13 @@ class ReportGenerator:
 
         return " ".join(points) + "."
 
-    def _generate_risk_factors(self, stock: StockData) -> list[str]:
+    def _generate_risk_factors(
+        self,
+        stock: StockData,
+        insiders: InsiderSummary,
+        upside: Optional[float],
+        now: datetime,
+    ) -> list[str]:
         """Generate specific, company-level risk factors weighted by severity.
         Each risk includes concrete data and is prioritized by impact x likelihood."""
         # (severity, text) — higher severity = more important risk
@@ -392,7 +470,7 @@ class ReportGenerator:
 
         # --- Earnings timing (high impact, certain) ---
         if stock.next_earnings_date:
-            days_until = (stock.next_earnings_date - datetime.now()).days
+            days_until = (stock.next_earnings_date - now).days
             if 0 < days_until <= 7:
                 weighted_risks.append((95, f"Earnings in {days_until} day{'s' if days_until != 1 else ''}—a miss could trigger a sharp selloff"))
             elif 7 < days_until <= 14:
@@ -463,16 +541,12 @@ class ReportGenerator:
             weighted_risks.append((50, f"Only {stock.analyst_count} analyst{'s' if stock.analyst_count != 1 else ''} cover {stock.ticker}—low scrutiny may hide risks"))
 
         # --- Analyst target implies downside ---
-        if stock.target_price_mean and stock.current_price and stock.current_price > 0:
-            upside = ((stock.target_price_mean - stock.current_price) / stock.current_price) * 100
-            if upside < -10:
-                weighted_risks.append((80, f"Avg analyst target ${stock.target_price_mean:.0f} implies {abs(upside):.0f}% downside from current ${stock.current_price:.2f}"))
+        if upside is not None and upside < -10:
+            weighted_risks.append((80, f"Avg analyst target ${stock.target_price_mean:.0f} implies {abs(upside):.0f}% downside from current ${stock.current_price:.2f}"))
 
         # --- Insider selling ---
-        recent_sells = [a for a in stock.insider_activity if a.get("type") == "sell"]
-        recent_buys = [a for a in stock.insider_activity if a.get("type") == "buy"]
-        if recent_sells and len(recent_sells) > len(recent_buys) + 1:
-            total_sold = sum(a.get("value", 0) for a in recent_sells)
+        if insiders.sell_count > insiders.buy_count + 1:
+            total_sold = insiders.sell_value
             if total_sold > 1_000_000:
                 weighted_risks.append((70, f"Insiders net selling recently (${total_sold/1e6:.1f}M sold)—executives reducing their own exposure"))
 
@@ -485,7 +559,7 @@ class ReportGenerator:
             weighted_risks.append((45, f"{stock.institutional_ownership:.0f}% institutional ownership—any institutional selling would create outsized downward pressure"))
 
         # Sort by severity descending, take top 5
-        weighted_risks.sort(key=lambda x: x[0], reverse=True)
+        weighted_risks.sort(key=itemgetter(0), reverse=True)
         risks = [text for _, text in weighted_risks[:5]]
 
         # If no specific risks found, build company-specific context instead of generic message
@@ -502,6 +576,48 @@ class ReportGenerator:
 
         return risks
 
+    def _analyze(
+        self,
+        stock_data: StockData,
+        mentions: int,
+        sentiment: float,
+        score: float,
+        insiders: InsiderSummary,
+        upside: Optional[float],
+    ) -> AnalyzedStock:
+        """Run the ranking-stage analysis for a scored stock.
+
+        The buy case and risk factors are left empty; they are only written
+        for the final picks, by _write_narratives.
+        """
+        bullish, bearish, neutral = self._count_signals(stock_data, insiders)
+
+        return AnalyzedStock(
+            ticker=stock_data.ticker,
+            name=stock_data.name,
+            sector=stock_data.sector,
+            industry=stock_data.industry,
+            stock_data=stock_data,
+            reddit_mentions=mentions,
+            reddit_sentiment=sentiment,
+            score=score,
+            sector_category=_categorize_sector(stock_data.sector, stock_data.industry),
+            insiders=insiders,
+            upside_pct=upside,
+            bullish_signals=bullish,
+            bearish_signals=bearish,
+            neutral_signals=neutral,
+        )
+
+    def _write_narratives(self, analyzed: AnalyzedStock, now: datetime) -> None:
+        """Fill in the buy case and risk factors for a stock picked for the report."""
+        analyzed.buy_case = self._generate_buy_case(
+            analyzed.stock_data, analyzed.reddit_sentiment, analyzed.insiders, analyzed.upside_pct
+        )
+        analyzed.risk_factors = self._generate_risk_factors(
+            analyzed.stock_data, analyzed.insiders, analyzed.upside_pct, now
+        )
+
     def _identify_dark_horses(self, analyzed: list[AnalyzedStock]) -> list[AnalyzedStock]:
         """Identify dark horse candidates from analyzed stocks."""
         dark_horses = []
@@ -537,31 +653,50 @@ class ReportGenerator:
 
         return dark_horses
 
-    def _get_or_create_stock(self, stock_data: StockData) -> Stock:
-        """Get existing stock from DB or create new one."""
-        stock = self.db.query(Stock).filter(Stock.ticker == stock_data.ticker).first()
-
-        if not stock:
-            stock = Stock(
-                ticker=stock_data.ticker,
-                name=stock_data.name,
-                sector=stock_data.sector,
-                industry=stock_data.industry,
-                market_cap=stock_data.market_cap,
-                market_cap_category=stock_data.market_cap_category,
-            )
-            self.db.add(stock)
+    def _get_or_create_stocks(self, stock_datas: list[StockData]) -> dict[str, Stock]:
+        """Get existing stocks from DB or create new ones, keyed by ticker.
+
+        Existing rows are loaded with a single IN query and new ones are
+        inserted in one flush.
+        """
+        tickers = [stock_data.ticker for stock_data in stock_datas]
+        stocks = {
+            stock.ticker: stock
+            for stock in self.db.query(Stock).filter(Stock.ticker.in_(tickers))
+        }
+
+        new_stocks = []
+        updated_at = datetime.utcnow()
+        for stock_data in stock_datas:
+            # Float column: keep the Python value as stored (0 -> 0.0), since
+            # serialized_json is encoded from these objects before reloading
+            market_cap = None if stock_data.market_cap is None else float(stock_data.market_cap)
+            stock = stocks.get(stock_data.ticker)
+            if not stock:
+                stock = Stock(
+                    ticker=stock_data.ticker,
+                    name=stock_data.name,
+                    sector=stock_data.sector,
+                    industry=stock_data.industry,
+                    market_cap=market_cap,
+                    market_cap_category=stock_data.market_cap_category,
+                )
+                stocks[stock_data.ticker] = stock
+                new_stocks.append(stock)
+            else:
+                # Update existing stock info
+                stock.name = stock_data.name
+                stock.sector = stock_data.sector
+                stock.industry = stock_data.industry
+                stock.market_cap = market_cap
+                stock.market_cap_category = stock_data.market_cap_category
+                stock.updated_at = updated_at
+
+        if new_stocks:
+            self.db.add_all(new_stocks)
             self.db.flush()
-        else:
-            # Update existing stock info
-            stock.name = stock_data.name
-            stock.sector = stock_data.sector
-            stock.industry = stock_data.industry
-            stock.market_cap = stock_data.market_cap
-            stock.market_cap_category = stock_data.market_cap_category
-            stock.updated_at = datetime.utcnow()
 
-        return stock
+        return stocks
 
     def _get_sentiment_label(self, sentiment: float) -> str:
         """Convert sentiment score to label."""
@@ -581,6 +716,10 @@ class ReportGenerator:
         """
         logger.info("Starting daily report generation...")
 
+        # One clock read for the whole run, so earnings countdowns and the
+        # report date agree
+        now = datetime.now()
+
         # Step 1: Get stock mentions from available sources
         # For now, use fallback list to ensure fast report generation
         # TODO: Re-enable Finnhub/Reddit once we optimize API calls
@@ -589,6 +728,7 @@ class ReportGenerator:
         # Try Reddit API first if configured
         if settings.REDDIT_CLIENT_ID:
             logger.info("Fetching from Reddit API...")
+            reddit_scraper = get_reddit_scraper()
             all_mentions = reddit_scraper.get_all_mentions()
             aggregated = reddit_scraper.aggregate_mentions(all_mentions)
 
@@ -624,10 +764,15 @@ class ReportGenerator:
         stock_data_map = stock_fetcher.fetch_multiple(qualifying_tickers)
 
         # Step 4: Filter and analyze stocks
-        analyzed_stocks: list[AnalyzedStock] = []
         skipped_invalid = 0
         skipped_ath = 0
 
+        valid_stocks: list[StockData] = []
+        valid_mentions: list[int] = []
+        valid_sentiments: list[float] = []
+        valid_insiders: list[InsiderSummary] = []
+        valid_upsides: list[Optional[float]] = []
+
         for ticker, stock_data in stock_data_map.items():
             if not stock_data.is_valid:
                 skipped_invalid += 1
@@ -636,8 +781,11 @@ class ReportGenerator:
 
             # Check if meets our criteria
             reddit_data = aggregated.get(ticker, {})
-            mentions = reddit_data.get("total_mentions", 0)
-            sentiment = reddit_data.get("avg_sentiment", 0.0)
+            valid_stocks.append(stock_data)
+            valid_mentions.append(reddit_data.get("total_mentions", 0))
+            valid_sentiments.append(reddit_data.get("avg_sentiment", 0.0))
+            valid_insiders.append(_summarize_insiders(stock_data.insider_activity))
+            valid_upsides.append(_target_upside(stock_data))
 
             # For now, include all stocks with valid data (relaxed filter)
             # Value investors can filter by pct_from_ath in the UI
@@ -646,37 +794,17 @@ class ReportGenerator:
             #     skipped_ath += 1
             #     continue
 
-            # Categorize sector
-            sector_category = self._categorize_sector(stock_data.sector, stock_data.industry)
-
-            # Calculate score
-            score = self._calculate_score(stock_data, mentions, sentiment)
-
-            # Count signals
-            bullish, bearish, neutral = self._count_signals(stock_data)
-
-            # Generate analysis
-            buy_case = self._generate_buy_case(stock_data, mentions, sentiment)
-            risk_factors = self._generate_risk_factors(stock_data)
-
-            analyzed = AnalyzedStock(
-                ticker=ticker,
-                name=stock_data.name,
-                sector=stock_data.sector,
-                industry=stock_data.industry,
-                stock_data=stock_data,
-                reddit_mentions=mentions,
-                reddit_sentiment=sentiment,
-                score=score,
-                sector_category=sector_category,
-                buy_case=buy_case,
-                risk_factors=risk_factors,
-                bullish_signals=bullish,
-                bearish_signals=bearish,
-                neutral_signals=neutral,
-            )
+        # Calculate scores for the whole batch at once
+        scores = _calculate_scores(
+            valid_stocks, valid_mentions, valid_sentiments, valid_insiders, valid_upsides
+        )
 
-            analyzed_stocks.append(analyzed)
+        analyzed_stocks: list[AnalyzedStock] = [
+            self._analyze(stock_data, mentions, sentiment, score, insiders, upside)
+            for stock_data, mentions, sentiment, score, insiders, upside in zip(
+                valid_stocks, valid_mentions, valid_sentiments, scores, valid_insiders, valid_upsides
+            )
+        ]
 
         logger.info(f"{len(analyzed_stocks)} stocks pass all criteria")
 
@@ -689,12 +817,15 @@ class ReportGenerator:
         logger.info(f"Identified {len(dark_horses)} potential dark horse picks")
 
         # Step 6: Rank and select top stocks
-        # Sort by score descending
-        analyzed_stocks.sort(key=lambda x: x.score, reverse=True)
-
-        # Select top stocks, ensuring we include dark horses
+        # Select top stocks by score, ensuring we include dark horses. nlargest
+        # keeps only the top picks on a heap instead of sorting every stock,
+        # with the same stable tie order as a full sort
         main_picks_count = settings.TOP_STOCKS_COUNT - settings.DARK_HORSE_COUNT
-        main_picks = [s for s in analyzed_stocks if not s.is_dark_horse][:main_picks_count]
+        main_picks = heapq.nlargest(
+            main_picks_count,
+            (s for s in analyzed_stocks if not s.is_dark_horse),
+            key=attrgetter("score"),
+        )
 
         # Add dark horses
         dark_horse_picks = dark_horses[:settings.DARK_HORSE_COUNT]
@@ -702,8 +833,12 @@ class ReportGenerator:
         # Combine and assign ranks
         final_picks = main_picks + dark_horse_picks
 
+        # Narrative text is only needed for stocks that made the report
+        for analyzed in final_picks:
+            self._write_narratives(analyzed, now)
+
         # Step 7: Create report in database
-        report_date = datetime.now().replace(hour=21, minute=0, second=0, microsecond=0)
+        report_date = now.replace(hour=21, minute=0, second=0, microsecond=0)
 
         # Check if report already exists for today
         existing = self.db.query(DailyReport).filter(
@@ -716,7 +851,7 @@ class ReportGenerator:
             self.db.flush()
 
         # Select random tip of the day
-        tip = random.choice(INVESTMENT_TIPS)
+        tip_title, tip_content = random.choice(INVESTMENT_TIPS)
 
         # Fetch market context (index performance + news)
         logger.info("Fetching market context...")
@@ -730,34 +865,28 @@ class ReportGenerator:
             report_date=report_date,
             total_stocks_analyzed=len(qualifying_tickers),
             stocks_passing_criteria=len(analyzed_stocks),
-            tip_of_the_day_title=tip["title"],
-            tip_of_the_day_content=tip["content"],
+            tip_of_the_day_title=tip_title,
+            tip_of_the_day_content=tip_content,
             market_summary=market_ctx.market_summary if market_ctx else None,
             sp500_change=market_ctx.sp500_change if market_ctx else None,
             nasdaq_change=market_ctx.nasdaq_change if market_ctx else None,
             dow_change=market_ctx.dow_change if market_ctx else None,
             vix_level=market_ctx.vix_level if market_ctx else None,
-            market_news=market_ctx.market_news if market_ctx else None,
+            market_news=list(market_ctx.market_news) if market_ctx else [],
         )
         self.db.add(report)
         self.db.flush()
 
         # Step 8: Add stocks to report
+        # Rows are collected as dicts and inserted in one executemany,
+        # skipping per-object unit-of-work bookkeeping
+        report_stock_rows = []
+        stocks = self._get_or_create_stocks([analyzed.stock_data for analyzed in final_picks])
         for rank, analyzed in enumerate(final_picks, 1):
             stock_data = analyzed.stock_data
+            stock = stocks[stock_data.ticker]
 
-            # Get or create stock in DB
-            stock = self._get_or_create_stock(stock_data)
-
-            # Calculate target upside
-            target_upside = None
-            if stock_data.target_price_mean and stock_data.current_price:
-                target_upside = round(
-                    ((stock_data.target_price_mean - stock_data.current_price) /
-                     stock_data.current_price) * 100, 2
-                )
-
-            report_stock = ReportStock(
+            row = dict(
                 report_id=report.id,
                 stock_id=stock.id,
                 rank=rank,
@@ -800,21 +929,29 @@ class ReportGenerator:
                 analyst_rating=stock_data.analyst_rating,
                 analyst_count=stock_data.analyst_count,
                 target_price_mean=stock_data.target_price_mean,
-                target_upside_pct=target_upside,
+                target_upside_pct=(
+                    round(analyzed.upside_pct, 2) if analyzed.upside_pct is not None else None
+                ),
                 next_earnings_date=stock_data.next_earnings_date,
                 reddit_mentions_week=analyzed.reddit_mentions,
                 reddit_sentiment=analyzed.reddit_sentiment,
                 sentiment_label=self._get_sentiment_label(analyzed.reddit_sentiment),
-                insider_activity=stock_data.insider_activity,
+                insider_activity=stock_data.insider_activity or [],
                 buy_case=analyzed.buy_case,
-                risk_factors=analyzed.risk_factors,
-                recent_news=stock_data.recent_news,
-                dark_horse_reasons=analyzed.dark_horse_reasons if analyzed.is_dark_horse else None,
+                risk_factors=analyzed.risk_factors or [],
+                recent_news=stock_data.recent_news or [],
+                dark_horse_reasons=analyzed.dark_horse_reasons if analyzed.is_dark_horse else [],
                 bullish_signals=analyzed.bullish_signals,
                 bearish_signals=analyzed.bearish_signals,
                 neutral_signals=analyzed.neutral_signals,
             )
-            self.db.add(report_stock)
+            # Encode the API row now so serving the report is a byte splice
+            _coerce_report_stock_row(row)
+            row["serialized_json"] = dumps(build_stock_row(SimpleNamespace(**row), stock))
+            report_stock_rows.append(row)
+
+        if report_stock_rows:
+            self.db.execute(insert(ReportStock), report_stock_rows)
 
         self.db.commit()
         logger.info(f"Report generated successfully with {len(final_picks)} stocks")
@@ -8,6 +8,9 @@ if [ "$WORKER_LOWER" = "true" ]; then
     echo "Starting worker (scheduler)..."
     exec python -m app.scheduler
 else
+    echo "Running database migrations..."
+    # The web server doesn't migrate at startup, so never serve an old schema
+    python -m app.migrate || exit 1
     echo "Starting web server..."
     exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8000}
 fi